@@ -0,0 +1,402 @@
+"""
+In-process benchmarks for the three APIs
+- week3: calculator (Learn/week3/my-first-api/main.py)
+- week4: in-memory todo API (Learn/week4/app.py)
+- week5: SQLAlchemy todo API (Learn/week5/todoapi)
+
+Each app is driven through httpx's ASGITransport, so requests go through
+the full FastAPI stack (routing, validation, serialization) without a
+server or network. Results are printed as a table and written as JSON so
+runs from different commits can be compared.
+
+Usage (needs httpx on top of each app's own dependencies):
+    python benchmarks/bench.py
+    python benchmarks/bench.py --suite week4 --sizes 1000,100000
+    python benchmarks/bench.py --output new.json --compare old.json
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+import argparse
+import asyncio
+import importlib
+import importlib.util
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+LEARN_DIR = Path(__file__).resolve().parent.parent
+WEEK3_DIR = LEARN_DIR / "week3" / "my-first-api"
+WEEK4_DIR = LEARN_DIR / "week4"
+WEEK5_DIR = LEARN_DIR / "week5" / "todoapi"
+
+# One benchmark operation: sends a request, returns the status code
+Operation = Callable[[httpx.AsyncClient, random.Random], Awaitable[int]]
+
+
+# ============= LOADING THE APPS =============
+# week4/app.py and the week5 `app` package share a name, so the single-file
+# apps are loaded under unique module names instead of being imported
+
+def load_module(name: str, path: Path):
+    sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_week3():
+    return load_module("bench_week3_main", WEEK3_DIR / "main.py")
+
+
+def load_week4():
+    # Keep the store in memory only: no write log, no snapshots
+    os.environ["TODO_DATA_DIR"] = ""
+    return load_module("bench_week4_app", WEEK4_DIR / "app.py")
+
+
+def load_week5(database_path: Path):
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    sys.path.insert(0, str(WEEK5_DIR))
+    return importlib.import_module("app.main")
+
+
+# ============= RUNNER =============
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def run_workload(
+    asgi_app,
+    operation: Operation,
+    requests: int,
+    concurrency: int,
+    seed: int,
+    warmup: int = 50
+) -> dict:
+    """Send `requests` requests from `concurrency` workers, measure each one"""
+    transport = httpx.ASGITransport(app=asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        rng = random.Random(seed)
+        for _ in range(warmup):
+            await operation(client, rng)
+
+        latencies: List[float] = []
+        errors = 0
+        remaining = requests
+
+        async def worker(worker_rng: random.Random):
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                status = await operation(client, worker_rng)
+                latencies.append(time.perf_counter() - start)
+                if status >= 400:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(random.Random(seed + i)) for i in range(concurrency)))
+        duration = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "duration_s": round(duration, 4),
+        "throughput_rps": round(requests / duration, 1) if duration else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+    }
+
+
+# ============= WORKLOADS =============
+
+def todo_payload(rng: random.Random) -> dict:
+    return {
+        "title": f"todo {rng.randrange(10**6)}",
+        "description": "benchmark todo",
+        "completed": rng.random() < 0.3,
+    }
+
+
+def crud_mix(collection: str, ids: List[int]) -> Operation:
+    """
+    50% get, 20% update, 15% create, 10% delete, 5% list
+
+    `collection` is the list/create URL exactly as the app routes it
+    (with or without a trailing slash); `ids` tracks live todos so every
+    request targets one that exists
+    """
+    base = collection.rstrip("/")
+
+    async def operation(client: httpx.AsyncClient, rng: random.Random) -> int:
+        roll = rng.random()
+        if roll < 0.50:
+            response = await client.get(f"{base}/{rng.choice(ids)}")
+        elif roll < 0.70:
+            response = await client.put(
+                f"{base}/{rng.choice(ids)}",
+                json={"completed": rng.random() < 0.5}
+            )
+        elif roll < 0.85:
+            response = await client.post(collection, json=todo_payload(rng))
+            if response.status_code < 400:
+                ids.append(response.json()["id"])
+        elif roll < 0.95 and len(ids) > 1:
+            # Swap-remove so picking a victim stays O(1)
+            i = rng.randrange(len(ids))
+            ids[i], ids[-1] = ids[-1], ids[i]
+            response = await client.delete(f"{base}/{ids.pop()}")
+        else:
+            response = await client.get(collection, params={"limit": 50})
+        return response.status_code
+    return operation
+
+
+def paginated_listing(collection: str, cursor_of: Callable[[httpx.Response], Optional[str]]) -> Operation:
+    """Walk the whole list page by page, starting over at the end"""
+    state = {"cursor": None}
+
+    async def operation(client: httpx.AsyncClient, rng: random.Random) -> int:
+        params = {"limit": 100}
+        if state["cursor"] is not None:
+            params["cursor"] = state["cursor"]
+        response = await client.get(collection, params=params)
+        state["cursor"] = cursor_of(response)
+        return response.status_code
+    return operation
+
+
+async def bench_week3(args) -> List[dict]:
+    main = load_week3()
+    results = []
+
+    def calculator(hot: bool) -> Operation:
+        # "hot" reuses a handful of inputs (cache hits), "cold" rarely repeats
+        space = 16 if hot else 10**9
+
+        async def operation(client: httpx.AsyncClient, rng: random.Random) -> int:
+            a, b = rng.randrange(space), rng.randrange(1, space)
+            path = rng.choice([
+                f"/add?a={a}&b={b}",
+                f"/divide?a={a}&b={b}",
+                f"/power?base={a % 10}&exponent={b % 5}",
+                f"/modulo?a={a}&b={b}",
+                f"/square/{a}",
+                f"/circle/{a}",
+                f"/temperature/{a}",
+            ])
+            return (await client.get(path)).status_code
+        return operation
+
+    for name, hot in (("single_op_hot", True), ("single_op_cold", False)):
+        main.response_cache.clear()
+        results.append({
+            "workload": name,
+            "size": None,
+            **await run_workload(main.app, calculator(hot), args.requests, args.concurrency, args.seed),
+        })
+
+    batch_size = 10_000
+
+    async def batch(client: httpx.AsyncClient, rng: random.Random) -> int:
+        response = await client.post("/batch", json={
+            "operation": "divide",
+            "operands": {
+                "a": [rng.random() * 100 for _ in range(batch_size)],
+                "b": [rng.randrange(10) for _ in range(batch_size)],
+            },
+        })
+        return response.status_code
+
+    results.append({
+        "workload": "batch_divide",
+        "size": batch_size,
+        **await run_workload(main.app, batch, max(1, args.requests // 100), args.concurrency, args.seed, warmup=2),
+    })
+    return results
+
+
+async def bench_week4(args) -> List[dict]:
+    module = load_week4()
+    results = []
+
+    for size in args.sizes:
+        rng = random.Random(args.seed)
+        created_at = datetime.now()
+        module.store.load([], 1)
+        module.store.create_many([
+            {**todo_payload(rng), "created_at": created_at} for _ in range(size)
+        ])
+        ids = list(range(1, size + 1))
+
+        for name, operation in (
+            ("crud_mix", crud_mix("/todos", ids)),
+            ("paginated_listing", paginated_listing(
+                "/todos", lambda response: response.headers.get("x-next-cursor")
+            )),
+        ):
+            print(f"  week4 {name} size={size}", file=sys.stderr)
+            results.append({
+                "workload": name,
+                "size": size,
+                **await run_workload(module.app, operation, args.requests, args.concurrency, args.seed),
+            })
+    return results
+
+
+async def bench_week5(args) -> List[dict]:
+    with tempfile.TemporaryDirectory() as tmp:
+        main = load_week5(Path(tmp) / "bench.db")
+        from sqlalchemy import insert
+        from app.database import Base, async_engine, engine
+        from app.models.todo import Todo
+
+        results = []
+        for size in args.sizes:
+            Base.metadata.drop_all(bind=engine)
+            Base.metadata.create_all(bind=engine)
+            rng = random.Random(args.seed)
+            with engine.begin() as connection:
+                for start in range(0, size, 10_000):
+                    rows = [todo_payload(rng) for _ in range(min(10_000, size - start))]
+                    connection.execute(insert(Todo), rows)
+            ids = list(range(1, size + 1))
+
+            for name, operation in (
+                ("crud_mix", crud_mix("/api/v1/todos/", ids)),
+                ("paginated_listing", paginated_listing(
+                    "/api/v1/todos/", lambda response: response.json()["next_cursor"]
+                )),
+            ):
+                print(f"  week5 {name} size={size}", file=sys.stderr)
+                results.append({
+                    "workload": name,
+                    "size": size,
+                    **await run_workload(main.app, operation, args.requests, args.concurrency, args.seed),
+                })
+
+        await async_engine.dispose()
+        engine.dispose()
+    return results
+
+
+SUITES = {
+    "week3": bench_week3,
+    "week4": bench_week4,
+    "week5": bench_week5,
+}
+
+
+# ============= REPORTING =============
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=LEARN_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def result_key(result: dict) -> tuple:
+    return result["suite"], result["workload"], result["size"], result["concurrency"]
+
+
+def print_table(results: List[dict], baseline: Optional[Dict[tuple, dict]] = None) -> None:
+    header = f"{'suite':6} {'workload':18} {'size':>8} {'req/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}"
+    if baseline is not None:
+        header += f" {'req/s Δ':>9} {'p99 Δ':>8}"
+    print(header)
+    for result in results:
+        latency = result["latency_ms"]
+        line = (
+            f"{result['suite']:6} {result['workload']:18} {str(result['size'] or '-'):>8} "
+            f"{result['throughput_rps']:>10.1f} {latency['p50']:>8.3f} {latency['p95']:>8.3f} "
+            f"{latency['p99']:>8.3f} {result['errors']:>6}"
+        )
+        old = (baseline or {}).get(result_key(result))
+        if old is not None:
+            throughput_change = result["throughput_rps"] / old["throughput_rps"] - 1 if old["throughput_rps"] else 0.0
+            p99_change = latency["p99"] / old["latency_ms"]["p99"] - 1 if old["latency_ms"]["p99"] else 0.0
+            line += f" {throughput_change:>+9.1%} {p99_change:>+8.1%}"
+        print(line)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--suite", choices=sorted(SUITES), action="append",
+                        help="Suite to run (repeatable, default: all)")
+    parser.add_argument("--sizes", default="1000,100000,1000000",
+                        help="Comma-separated todo counts for the todo APIs")
+    parser.add_argument("--requests", type=int, default=2000,
+                        help="Measured requests per workload")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Requests in flight at once")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=str(Path(__file__).parent / "results.json"),
+                        help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Earlier JSON results to compare against")
+    args = parser.parse_args(argv)
+    args.sizes = [int(size) for size in args.sizes.split(",") if size]
+    return args
+
+
+async def run(args: argparse.Namespace) -> List[dict]:
+    results = []
+    for suite in args.suite or sorted(SUITES):
+        print(f"Running {suite}...", file=sys.stderr)
+        for result in await SUITES[suite](args):
+            results.append({"suite": suite, **result})
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {result_key(result): result for result in json.load(f)["results"]}
+    print_table(results, baseline)
+    print(f"\nResults written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Request instrumentation shared by the week3, week4 and week5 apps
+
+    from instrumentation import instrument
+    instrument(app)  # after every route has been registered
+
+This adds:
+- per-route latency histograms, split into validation / handler /
+  serialization phases (see timing.py)
+- a Server-Timing header on every response
+- GET /metrics in the Prometheus text format
+- optionally, a sampling profiler for slow requests, with the latest
+  profiles at GET /debug/slow-requests
+
+`async def` endpoints should use this package's run_in_threadpool, so
+the profiler samples the worker thread instead of the idle event loop.
+"""
+from typing import Optional
+import os
+
+from fastapi import FastAPI
+from fastapi.responses import Response
+from fastapi.routing import APIRoute
+
+from .metrics import PROMETHEUS_CONTENT_TYPE, MetricsRegistry
+from .profiler import SlowRequestProfiler
+from .timing import TimingMiddleware, instrument_route, run_in_threadpool, sampled
+
+__all__ = [
+    "MetricsRegistry",
+    "SlowRequestProfiler",
+    "TimingMiddleware",
+    "instrument",
+    "instrument_route",
+    "run_in_threadpool",
+    "sampled",
+]
+
+
+def instrument(
+    app: FastAPI,
+    profile_threshold_ms: Optional[float] = None,
+    metrics_path: str = "/metrics"
+) -> MetricsRegistry:
+    """
+    Add timing middleware, /metrics and (opt-in) slow request profiling
+
+    - **profile_threshold_ms**: Profile requests slower than this; falls
+      back to the SLOW_REQUEST_PROFILE_MS environment variable, and
+      profiling stays off if neither is set
+
+    Must be called after all routes are registered: only routes that exist
+    at this point get per-phase timings.
+
+    Returns the metrics registry
+    """
+    if profile_threshold_ms is None and os.environ.get("SLOW_REQUEST_PROFILE_MS"):
+        profile_threshold_ms = float(os.environ["SLOW_REQUEST_PROFILE_MS"])
+
+    metrics = MetricsRegistry()
+    profiler = SlowRequestProfiler(profile_threshold_ms) if profile_threshold_ms else None
+
+    def prometheus_metrics():
+        return Response(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    app.add_api_route(metrics_path, prometheus_metrics, methods=["GET"], include_in_schema=False)
+
+    if profiler is not None:
+        def slow_requests():
+            return profiler.recent()
+
+        app.add_api_route("/debug/slow-requests", slow_requests, methods=["GET"], include_in_schema=False)
+
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            instrument_route(route)
+
+    app.add_middleware(TimingMiddleware, metrics=metrics, profiler=profiler)
+    return metrics
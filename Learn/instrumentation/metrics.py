@@ -0,0 +1,104 @@
+"""
+Latency histograms rendered in the Prometheus text format
+"""
+from bisect import bisect_left
+from threading import Lock
+from typing import Dict, List, Sequence, Tuple
+
+# Seconds; upper bounds of each bucket (Prometheus adds +Inf itself)
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Bucketed count of observations plus their sum"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: Dict[str, str]) -> str:
+    return ",".join(f'{name}="{escape_label(str(value))}"' for name, value in labels.items())
+
+
+class HistogramFamily:
+    """One Prometheus histogram metric, with a Histogram per label set"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets: Sequence[float]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._histograms: Dict[tuple, Histogram] = {}
+
+    def observe(self, label_values: tuple, value: float) -> None:
+        histogram = self._histograms.get(label_values)
+        if histogram is None:
+            histogram = self._histograms[label_values] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_values, histogram in sorted(self._histograms.items()):
+            labels = dict(zip(self.label_names, label_values))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), histogram.counts):
+                cumulative += count
+                le = bound if bound == "+Inf" else repr(float(bound))
+                lines.append(f"{self.name}_bucket{{{format_labels({**labels, 'le': le})}}} {cumulative}")
+            lines.append(f"{self.name}_sum{{{format_labels(labels)}}} {histogram.sum}")
+            lines.append(f"{self.name}_count{{{format_labels(labels)}}} {histogram.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Per-route request metrics
+
+    - http_request_duration_seconds{method, route, status}: whole request
+    - http_request_phase_duration_seconds{method, route, phase}: time spent
+      in validation, handler and serialization
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self._lock = Lock()
+        self.requests = HistogramFamily(
+            "http_request_duration_seconds",
+            "Time from receiving a request to sending the last response byte",
+            ("method", "route", "status"),
+            buckets,
+        )
+        self.phases = HistogramFamily(
+            "http_request_phase_duration_seconds",
+            "Time spent in each phase of handling a request",
+            ("method", "route", "phase"),
+            buckets,
+        )
+
+    def observe(self, method: str, route: str, status: int, duration: float, phases: Dict[str, float]) -> None:
+        with self._lock:
+            self.requests.observe((method, route, str(status)), duration)
+            for phase, seconds in phases.items():
+                self.phases.observe((method, route, phase), seconds)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            lines = [*self.requests.render(), *self.phases.render()]
+        return "\n".join(lines) + "\n"
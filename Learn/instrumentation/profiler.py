@@ -0,0 +1,124 @@
+"""
+Opt-in sampling profiler for slow requests
+
+While requests are in flight, a background thread periodically records
+the Python stack of every thread running their endpoint. When a request
+turns out slower than the threshold its samples are kept as a profile
+(folded stacks, ready for flamegraph tools); faster requests are dropped.
+
+`async def` endpoints share the event loop thread, so their samples can
+include frames from other requests running at the same time. Work they
+hand off with instrumentation.run_in_threadpool is sampled on the worker
+thread instead (see timing.py).
+"""
+from collections import Counter, deque
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, List, Optional
+import logging
+import os
+import sys
+import threading
+
+from .timing import RequestTimings
+
+logger = logging.getLogger(__name__)
+
+
+def fold_stack(frame, limit: int = 64) -> str:
+    """Stack as 'outer;...;inner' with one 'function (file:line)' per frame"""
+    names = []
+    while frame is not None and len(names) < limit:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SlowRequestProfiler:
+    """
+    Keeps stack samples for requests slower than `threshold_ms`
+
+    - **threshold_ms**: Requests at least this slow get a profile
+    - **interval_ms**: Time between stack samples
+    - **max_profiles**: How many recent profiles to keep
+    - **on_slow_request**: Called with each profile (default: log a summary)
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        interval_ms: float = 5.0,
+        max_profiles: int = 20,
+        on_slow_request: Optional[Callable[[dict], None]] = None
+    ):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.profiles: deque = deque(maxlen=max_profiles)
+        self.on_slow_request = on_slow_request or self._log_profile
+
+        self._lock = Lock()
+        self._active: Dict[int, RequestTimings] = {}
+        self._samples: Dict[int, Counter] = {}
+        self._stop = Event()
+        self._sampler: Optional[Thread] = None
+
+    # ---------- request lifecycle (called by TimingMiddleware) ----------
+
+    def begin(self, timings: RequestTimings) -> None:
+        with self._lock:
+            self._active[id(timings)] = timings
+            self._samples[id(timings)] = Counter()
+            if self._sampler is None:
+                # Started on first use, so importing an app doesn't spawn threads
+                self._sampler = Thread(target=self._run, name="slow-request-profiler", daemon=True)
+                self._sampler.start()
+
+    def end(self, timings: RequestTimings, status: int, duration: float, phases: Dict[str, float]) -> None:
+        with self._lock:
+            del self._active[id(timings)]
+            samples = self._samples.pop(id(timings))
+        if duration < self.threshold:
+            return
+
+        profile = {
+            "method": timings.method,
+            "path": timings.path,
+            "route": timings.route,
+            "status": status,
+            "duration_ms": round(duration * 1000, 3),
+            "phases_ms": {phase: round(seconds * 1000, 3) for phase, seconds in phases.items()},
+            "sample_interval_ms": self.interval * 1000,
+            "samples": sum(samples.values()),
+            "stacks": [{"stack": stack, "count": count} for stack, count in samples.most_common()],
+        }
+        self.profiles.append(profile)
+        self.on_slow_request(profile)
+
+    def recent(self) -> List[dict]:
+        """Most recent slow request profiles, newest first"""
+        return list(reversed(self.profiles))
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # ---------- sampling ----------
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                for key, timings in self._active.items():
+                    for thread in tuple(timings.threads):
+                        frame = frames.get(thread)
+                        if frame is not None and thread != me:
+                            self._samples[key][fold_stack(frame)] += 1
+            del frames
+
+    @staticmethod
+    def _log_profile(profile: dict) -> None:
+        hottest = profile["stacks"][0]["stack"].rsplit(";", 1)[-1] if profile["stacks"] else "-"
+        logger.warning(
+            "Slow request %s %s took %.1f ms (%s samples, hottest frame: %s)",
+            profile["method"], profile["path"], profile["duration_ms"], profile["samples"], hottest,
+        )
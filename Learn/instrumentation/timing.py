@@ -0,0 +1,219 @@
+"""
+Per-request phase timing for FastAPI routes
+
+A request is split into three phases:
+- validation: from the route being matched until the endpoint function
+  starts (reading the body, validating parameters, running dependencies;
+  for `def` endpoints this also includes waiting for a threadpool thread)
+- handler: the endpoint function itself
+- serialization: from the endpoint returning until the response headers
+  are sent (response_model validation, jsonable_encoder, JSON rendering)
+"""
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from typing import TYPE_CHECKING, Dict, Optional, Set
+import inspect
+import threading
+
+from fastapi.concurrency import run_in_threadpool as _run_in_threadpool
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+
+from .metrics import MetricsRegistry
+
+if TYPE_CHECKING:
+    from .profiler import SlowRequestProfiler
+
+PHASES = ("validation", "handler", "serialization")
+
+
+class RequestTimings:
+    """Timestamps (perf_counter) collected while one request is handled"""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.route = "unmatched"
+        self.start = perf_counter()
+        self.route_start: Optional[float] = None
+        self.handler_start: Optional[float] = None
+        self.handler_end: Optional[float] = None
+        self.response_start: Optional[float] = None
+        # Threads currently running this request's endpoint (used by the
+        # profiler); empty otherwise, so samples don't show the idle loop
+        self.threads: Set[int] = set()
+
+    def phases(self) -> Dict[str, float]:
+        """Seconds spent in each phase that was reached"""
+        end = self.response_start if self.response_start is not None else perf_counter()
+        if self.route_start is None:
+            return {}
+        if self.handler_start is None:
+            # Validation failed (or a dependency raised) before the handler ran
+            return {"validation": end - self.route_start}
+        handler_end = self.handler_end if self.handler_end is not None else end
+        return {
+            "validation": self.handler_start - self.route_start,
+            "handler": handler_end - self.handler_start,
+            "serialization": end - handler_end,
+        }
+
+    def server_timing(self) -> str:
+        """Value for the Server-Timing response header (milliseconds)"""
+        end = self.response_start if self.response_start is not None else perf_counter()
+        entries = [f"{phase};dur={seconds * 1000:.3f}" for phase, seconds in self.phases().items()]
+        entries.append(f"total;dur={(end - self.start) * 1000:.3f}")
+        return ", ".join(entries)
+
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("current_timings", default=None)
+
+
+# ============= ROUTE WRAPPING =============
+
+def instrument_route(route: APIRoute) -> None:
+    """
+    Time the phases of one route
+
+    FastAPI looks up `route.app` and `route.dependant.call` on every
+    request, so both are wrapped in place; the endpoint keeps its
+    sync/async kind so FastAPI still runs `def` endpoints in the threadpool.
+    """
+    if getattr(route, "_instrumented", False):
+        return
+    route._instrumented = True
+
+    route_app = route.app
+    template = route.path_format
+
+    async def timed_app(scope, receive, send):
+        timings = current_timings.get()
+        if timings is not None:
+            timings.route = template
+            timings.route_start = perf_counter()
+        await route_app(scope, receive, send)
+
+    route.app = timed_app
+
+    endpoint = route.dependant.call
+    if inspect.iscoroutinefunction(endpoint):
+        @wraps(endpoint)
+        async def timed_endpoint(*args, **kwargs):
+            timings = current_timings.get()
+            if timings is None:
+                return await endpoint(*args, **kwargs)
+            thread = threading.get_ident()
+            timings.threads.add(thread)
+            timings.handler_start = perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                timings.handler_end = perf_counter()
+                timings.threads.discard(thread)
+    else:
+        @wraps(endpoint)
+        def timed_endpoint(*args, **kwargs):
+            timings = current_timings.get()
+            if timings is None:
+                return endpoint(*args, **kwargs)
+            thread = threading.get_ident()
+            timings.threads.add(thread)
+            timings.handler_start = perf_counter()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                timings.handler_end = perf_counter()
+                timings.threads.discard(thread)
+
+    route.dependant.call = timed_endpoint
+
+
+# ============= THREADPOOL =============
+
+def sampled(func):
+    """
+    Wrap `func` so the profiler samples the thread running it
+
+    Meant for functions handed to another thread (e.g. a threadpool);
+    current_timings is copied into that thread along with the context.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        timings = current_timings.get()
+        if timings is None:
+            return func(*args, **kwargs)
+        thread = threading.get_ident()
+        timings.threads.add(thread)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings.threads.discard(thread)
+
+    return wrapper
+
+
+async def run_in_threadpool(func, *args, **kwargs):
+    """
+    fastapi.concurrency.run_in_threadpool, visible to the profiler
+
+    Use it in `async def` endpoints: the worker thread is sampled instead
+    of the event loop, which is only idling while it waits.
+    """
+    timings = current_timings.get()
+    if timings is None:
+        return await _run_in_threadpool(func, *args, **kwargs)
+
+    loop_thread = threading.get_ident()
+    was_sampled = loop_thread in timings.threads
+    timings.threads.discard(loop_thread)
+    try:
+        return await _run_in_threadpool(sampled(func), *args, **kwargs)
+    finally:
+        if was_sampled:
+            timings.threads.add(loop_thread)
+
+
+# ============= MIDDLEWARE =============
+
+class TimingMiddleware:
+    """
+    ASGI middleware that times every HTTP request
+
+    Adds a Server-Timing header, records the phase histograms and, if a
+    profiler is attached, hands slow requests over to it.
+    """
+
+    def __init__(self, app, metrics: MetricsRegistry, profiler: Optional["SlowRequestProfiler"] = None):
+        self.app = app
+        self.metrics = metrics
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings(scope["method"], scope["path"])
+        token = current_timings.set(timings)
+        if self.profiler is not None:
+            self.profiler.begin(timings)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timings.response_start = perf_counter()
+                MutableHeaders(scope=message).append("Server-Timing", timings.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            duration = perf_counter() - timings.start
+            phases = timings.phases()
+            self.metrics.observe(timings.method, timings.route, status, duration, phases)
+            if self.profiler is not None:
+                self.profiler.end(timings, status, duration, phases)
+            current_timings.reset(token)
@@ -0,0 +1,126 @@
+"""
+Response cache for pure endpoints
+Remembers the serialized response for each set of parameters
+"""
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+from typing import Callable, NamedTuple, Optional
+import hashlib
+import inspect
+import time
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+class CachedResponse(NamedTuple):
+    """A response that has already been turned into bytes"""
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of pre-serialized JSON responses
+
+    Only use it on endpoints whose result depends on nothing but their
+    parameters. Entries are dropped when they are older than `ttl` seconds
+    or when the cache holds more than `max_size` of them (least recently
+    used goes first).
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl: float = 300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[tuple, CachedResponse]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def stats(self) -> dict:
+        """Get hit/miss/eviction counters"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, key: tuple) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def _put(self, key: tuple, body: bytes) -> CachedResponse:
+        etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        entry = CachedResponse(body, etag, time.monotonic() + self.ttl)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def cached(self, func: Callable) -> Callable:
+        """
+        Decorator for a pure GET endpoint
+
+        The key is the endpoint name plus its validated parameters, so
+        `?a=5&b=3`, `?b=3&a=5` and `?a=5.0&b=3` all share one entry.
+        Responses carry `ETag` and `Cache-Control` headers and a matching
+        `If-None-Match` gets an empty 304.
+        """
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(_request: Request, **params):
+            # repr keeps 0.0 and -0.0 apart (they compare equal)
+            key = (func.__name__, *((name, repr(params[name])) for name in sorted(params)))
+            entry = self._get(key)
+            status = "HIT"
+            if entry is None:
+                content = jsonable_encoder(func(**params))
+                entry = self._put(key, JSONResponse(content).body)
+                status = "MISS"
+
+            headers = {
+                "ETag": entry.etag,
+                "Cache-Control": f"public, max-age={int(self.ttl)}",
+                "X-Cache": status,
+            }
+            if_none_match = _request.headers.get("if-none-match", "")
+            if if_none_match.strip() == "*" or entry.etag in (
+                tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+            ):
+                return Response(status_code=304, headers=headers)
+            return Response(entry.body, media_type="application/json", headers=headers)
+
+        # Let FastAPI inject the request alongside the endpoint's own parameters
+        wrapper.__signature__ = signature.replace(parameters=[
+            inspect.Parameter("_request", inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=Request),
+            *signature.parameters.values(),
+        ])
+        return wrapper
@@ -1,4 +1,20 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+from pathlib import Path
+from typing import Callable, Dict, List, Literal, NamedTuple, Optional, Union
+import math
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, /batch falls back to plain Python
+    np = None
+
+from cache import ResponseCache
+
+# Shared request instrumentation lives in Learn/instrumentation
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from instrumentation import instrument
 
 app = FastAPI(
     title="My Calculator API",
@@ -6,6 +22,10 @@ app = FastAPI(
     version="1.0.1"
 )
 
+# Every GET endpoint below is a pure function of its parameters,
+# so repeated requests are answered from this cache
+response_cache = ResponseCache(max_size=10_000, ttl=300)
+
 @app.get("/")
 def home():
     return {
@@ -15,11 +35,14 @@ def home():
             "subtract": "/subtract?a=10&b=4",
             "multiply": "/multiply?a=6&b=7",
             "divide": "/divide?a=20&b=5",
-            "power": "/power?base=2&exponent=3"
+            "power": "/power?base=2&exponent=3",
+            "batch": "POST /batch",
+            "cache_stats": "/cache/stats"
         }
     }
 
 @app.get("/add")
+@response_cache.cached
 def add(a: float, b: float):
     """Add two numbers"""
     return {
@@ -30,6 +53,7 @@ def add(a: float, b: float):
     }
 
 @app.get("/subtract")
+@response_cache.cached
 def subtract(a: float, b: float):
     """Subtract b from a"""
     return {
@@ -40,6 +64,7 @@ def subtract(a: float, b: float):
     }
 
 @app.get("/multiply")
+@response_cache.cached
 def multiply(a: float, b: float):
     """Multiply two numbers"""
     return {
@@ -50,6 +75,7 @@ def multiply(a: float, b: float):
     }
 
 @app.get("/divide")
+@response_cache.cached
 def divide(a: float, b: float):
     """Divide a by b"""
     if b == 0:
@@ -64,6 +90,7 @@ def divide(a: float, b: float):
     }
 
 @app.get("/power")
+@response_cache.cached
 def power(base: float, exponent: float):
     """Calculate base raised to exponent"""
     return {
@@ -74,6 +101,7 @@ def power(base: float, exponent: float):
     }
 
 @app.get("/square/{number}")
+@response_cache.cached
 def square(number: float):
     """Calculate square of a number"""
     return {
@@ -82,6 +110,7 @@ def square(number: float):
     }
 
 @app.get("/cube/{number}")
+@response_cache.cached
 def cube(number: float):
     """Calculate cube of a number"""
     return {
@@ -90,6 +119,7 @@ def cube(number: float):
     }
 
 @app.get("/modulo")
+@response_cache.cached
 def modulo(a:int, b:int):
     """Calculate a modulo b"""
     if b == 0:
@@ -104,6 +134,7 @@ def modulo(a:int, b:int):
     }
 
 @app.get("/circle/{radius}")
+@response_cache.cached
 def circle_calculations(radius: float):
     """Calculate circle area and circumference"""
     pi = 3.14159
@@ -116,6 +147,7 @@ def circle_calculations(radius: float):
     }
 
 @app.get("/temperature/{celsius}")
+@response_cache.cached
 def temperature_conversion(celsius: float):
     """Convert Celsius to Fahrenheit"""
     fahrenheit = (celsius * 9/5) + 32
@@ -123,3 +155,169 @@ def temperature_conversion(celsius: float):
         "celsius": celsius,
         "fahrenheit": round(fahrenheit, 2)
     }
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    """Response cache hit/miss/eviction counters"""
+    return response_cache.stats()
+
+# ============= BATCH EVALUATION =============
+# One request evaluates a whole column of inputs for any operation above.
+# Operands are sent as arrays named after the single-operation parameters,
+# e.g. {"operation": "power", "operands": {"base": [...], "exponent": [...]}}
+
+class BatchOperation(NamedTuple):
+    """How to evaluate one operation over columns of operands"""
+    params: List[str]
+    outputs: Dict[str, Callable]
+    integer: bool = False
+    nonzero: Optional[str] = None  # operand that must not be zero
+    decimals: Optional[int] = None  # round outputs like the single endpoints
+
+PI = 3.14159
+
+# NumPy evaluates integer operations in int64; larger values use plain Python
+INT64_MIN, INT64_MAX = -2**63, 2**63 - 1
+
+BATCH_OPERATIONS: Dict[str, BatchOperation] = {
+    "add": BatchOperation(["a", "b"], {"result": lambda a, b: a + b}),
+    "subtract": BatchOperation(["a", "b"], {"result": lambda a, b: a - b}),
+    "multiply": BatchOperation(["a", "b"], {"result": lambda a, b: a * b}),
+    "divide": BatchOperation(["a", "b"], {"result": lambda a, b: a / b}, nonzero="b"),
+    "power": BatchOperation(["base", "exponent"], {"result": lambda base, exponent: base ** exponent}),
+    "modulo": BatchOperation(["a", "b"], {"result": lambda a, b: a % b}, integer=True, nonzero="b"),
+    "square": BatchOperation(["number"], {"square": lambda number: number ** 2}),
+    "cube": BatchOperation(["number"], {"cube": lambda number: number ** 3}),
+    "circle": BatchOperation(
+        ["radius"],
+        {
+            "area": lambda radius: PI * radius ** 2,
+            "circumference": lambda radius: 2 * PI * radius,
+        },
+        decimals=2,
+    ),
+    "temperature": BatchOperation(
+        ["celsius"],
+        {"fahrenheit": lambda celsius: (celsius * 9/5) + 32},
+        decimals=2,
+    ),
+}
+
+class BatchRequest(BaseModel):
+    """Columns of operands for one operation"""
+    operation: Literal[
+        "add", "subtract", "multiply", "divide", "power",
+        "modulo", "square", "cube", "circle", "temperature"
+    ]
+    # int before float, so integers are kept exact (e.g. 2**53 + 1 for modulo)
+    operands: Dict[str, List[Union[int, float]]] = Field(
+        ...,
+        description="One array per operand, all the same length",
+        examples=[{"a": [1, 2, 3], "b": [4, 5, 0]}]
+    )
+
+def evaluate_numpy(spec: BatchOperation, columns: List[list]):
+    """Evaluate a whole batch with vectorized NumPy operations"""
+    dtype = np.int64 if spec.integer else np.float64
+    arrays = [np.asarray(column, dtype=dtype) for column in columns]
+    
+    # Division by zero, overflow etc. are reported through the error mask
+    with np.errstate(all="ignore"):
+        outputs = {name: fn(*arrays) for name, fn in spec.outputs.items()}
+        error_mask = np.zeros(len(arrays[0]), dtype=bool)
+        if spec.nonzero is not None:
+            error_mask |= arrays[spec.params.index(spec.nonzero)] == 0
+        for name, values in outputs.items():
+            error_mask |= ~np.isfinite(values)
+            if spec.decimals is not None:
+                outputs[name] = np.round(values, spec.decimals)
+    
+    mask = error_mask.tolist()
+    results = {
+        name: [None if error else value for value, error in zip(values.tolist(), mask)]
+        for name, values in outputs.items()
+    }
+    return results, mask
+
+def evaluate_python(spec: BatchOperation, columns: List[list]):
+    """
+    Evaluate a batch one row at a time
+    
+    Used when NumPy isn't installed, or for integers too big for int64
+    """
+    nonzero = None if spec.nonzero is None else spec.params.index(spec.nonzero)
+    
+    results = {name: [] for name in spec.outputs}
+    mask = []
+    for row in zip(*columns):
+        try:
+            if nonzero is not None and row[nonzero] == 0:
+                raise ZeroDivisionError
+            values = {name: fn(*row) for name, fn in spec.outputs.items()}
+            # e.g. a negative base with a fractional exponent gives a complex number
+            if not all(isinstance(v, (int, float)) and math.isfinite(v) for v in values.values()):
+                raise ArithmeticError
+        except ArithmeticError:
+            mask.append(True)
+            for name in results:
+                results[name].append(None)
+            continue
+        
+        mask.append(False)
+        for name, value in values.items():
+            if spec.decimals is not None:
+                value = round(value, spec.decimals)
+            results[name].append(value)
+    return results, mask
+
+@app.post("/batch")
+def batch(request: BatchRequest):
+    """
+    Evaluate one operation over arrays of operands
+    
+    - **operation**: Any single operation (add, divide, power, circle, ...)
+    - **operands**: One array per parameter of that operation
+    
+    Returns one array per output. Elements that can't be computed
+    (e.g. divide or modulo by zero) are null and flagged in **error_mask**.
+    """
+    spec = BATCH_OPERATIONS[request.operation]
+    
+    if set(request.operands) != set(spec.params):
+        raise HTTPException(
+            status_code=422,
+            detail=f"Operation '{request.operation}' needs operands {spec.params}"
+        )
+    columns = [request.operands[param] for param in spec.params]
+    count = len(columns[0])
+    if any(len(column) != count for column in columns):
+        raise HTTPException(status_code=422, detail="All operand arrays must be the same length")
+    if spec.integer:
+        if not all(isinstance(value, int) or value.is_integer() for column in columns for value in column):
+            raise HTTPException(
+                status_code=422,
+                detail=f"Operation '{request.operation}' needs integer operands"
+            )
+        columns = [[int(value) for value in column] for column in columns]
+        fits_numpy = all(INT64_MIN <= value <= INT64_MAX for column in columns for value in column)
+    else:
+        try:
+            columns = [[float(value) for value in column] for column in columns]
+        except OverflowError:
+            raise HTTPException(status_code=422, detail="Operands must fit in a float")
+        fits_numpy = True
+    
+    evaluate = evaluate_numpy if np is not None and fits_numpy else evaluate_python
+    results, error_mask = evaluate(spec, columns)
+    
+    return {
+        "operation": request.operation,
+        "count": count,
+        "results": results,
+        "error_mask": error_mask,
+        "error_count": sum(error_mask)
+    }
+
+# Timing histograms, Server-Timing header and /metrics for every route above
+instrument(app)
@@ -1,12 +1,38 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+from contextlib import asynccontextmanager
 from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+import os
+import sys
+
+from persistence import Persistence
+from serialization import RecordEncoder
+from store import TodoStore
+
+# Shared request instrumentation lives in Learn/instrumentation
+# (its run_in_threadpool lets the slow-request profiler see the worker thread)
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from instrumentation import instrument, run_in_threadpool
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load todos from disk on startup, snapshot them on shutdown"""
+    if persistence is not None:
+        await run_in_threadpool(persistence.open)
+    yield
+    if persistence is not None:
+        await run_in_threadpool(persistence.close)
 
 app = FastAPI(
     title="Todo List API",
     description="A simple todo list API with CRUD operations",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # ============= MODELS =============
@@ -27,6 +53,10 @@ class TodoUpdate(BaseModel):
     description: Optional[str] = Field(None, max_length=500)
     completed: Optional[bool] = None
 
+class TodoBatchUpdate(TodoUpdate):
+    """Model for one item of a batch update - TodoUpdate plus the ID to update"""
+    id: int
+
 class TodoResponse(TodoBase):
     """Model for todo response - includes ID and timestamp"""
     id: int
@@ -38,10 +68,131 @@ class TodoResponse(TodoBase):
 
 # ============= IN-MEMORY DATABASE =============
 # In a real app, this would be a real database
-# For now, we'll use a simple list
+# For now, we keep todos in memory, indexed by ID and completion status,
+# and persist them to a write log + snapshots in TODO_DATA_DIR
+# (set TODO_DATA_DIR to an empty string to keep everything in memory only)
+
+store = TodoStore()
+
+DATA_DIR = os.environ.get("TODO_DATA_DIR", "data")
+persistence = Persistence(store, DATA_DIR) if DATA_DIR else None
+
+# ============= RESPONSES =============
+# Todos in the store were built by this API from validated input, so by
+# default they're encoded straight to JSON bytes instead of being
+# re-validated through TodoResponse and jsonable_encoder. Routes keep their
+# response_model, so the OpenAPI schema is unchanged.
+# Set TODO_VALIDATE_RESPONSES=1 to validate every response again (debugging).
+
+VALIDATE_RESPONSES = os.environ.get("TODO_VALIDATE_RESPONSES", "") not in ("", "0")
+todo_encoder = RecordEncoder(TodoResponse)
+
+def todo_response(todo: dict, status_code: int = 200):
+    """Return one todo from an endpoint declared with response_model=TodoResponse"""
+    if VALIDATE_RESPONSES:
+        return todo
+    return Response(todo_encoder.encode(todo), status_code=status_code, media_type="application/json")
+
+def todos_response(
+    todos: List[dict],
+    status_code: int = 200,
+    response: Optional[Response] = None,
+    headers: Optional[dict] = None
+):
+    """
+    Return a list of todos from an endpoint declared with
+    response_model=List[TodoResponse]
+    
+    `headers` are added to the response; in validation mode they go on the
+    endpoint's injected `response`
+    """
+    if VALIDATE_RESPONSES:
+        if headers:
+            response.headers.update(headers)
+        return todos
+    return Response(
+        todo_encoder.encode_many(todos),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers
+    )
+
+# ============= BATCH BODY PARSING =============
+# Batch endpoints accept either a JSON array or newline-delimited JSON
+# (one item per line). A JSON array is validated in a single pass by
+# pydantic-core; NDJSON is validated line by line as the body streams in,
+# so large imports never need the whole raw body in memory.
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def batch_request_body(item_schema: dict) -> dict:
+    """OpenAPI request body for a batch endpoint (JSON array or NDJSON)"""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": item_schema}},
+                NDJSON_MEDIA_TYPE: {"schema": item_schema},
+            },
+        }
+    }
+
+@lru_cache()
+def get_adapter(tp) -> TypeAdapter:
+    """Build each validator once instead of on every request"""
+    return TypeAdapter(tp)
 
-todos_db: List[dict] = []
-next_id = 1
+async def iter_ndjson_lines(request: Request) -> AsyncIterator[Tuple[int, bytes]]:
+    """Yield (line number, line) for each non-empty line of a streamed body"""
+    buffer = b""
+    line_no = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+    if buffer.strip():
+        yield line_no + 1, buffer
+
+def body_errors(e: ValidationError, *loc) -> List[dict]:
+    """
+    Errors from `e` with `loc` prefixed, ready for RequestValidationError
+    
+    Invalid JSON keeps the raw bytes as `input`, which can't be rendered
+    if they aren't UTF-8, so bytes are decoded (bad bytes replaced)
+    """
+    errors = []
+    for error in e.errors(include_url=False):
+        error = {**error, "loc": (*loc, *error["loc"])}
+        if isinstance(error.get("input"), bytes):
+            error["input"] = error["input"].decode("utf-8", errors="replace")
+        errors.append(error)
+    return errors
+
+async def parse_batch(request: Request, item_type: type) -> list:
+    """
+    Validate a whole batch body before anything is applied
+    
+    Raises a 422 listing every invalid item if any of them fail
+    """
+    if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+        item_adapter = get_adapter(item_type)
+        items, errors = [], []
+        async for line_no, line in iter_ndjson_lines(request):
+            try:
+                items.append(item_adapter.validate_json(line))
+            except ValidationError as e:
+                errors.extend(body_errors(e, "body", line_no))
+        if errors:
+            raise RequestValidationError(errors)
+        return items
+    
+    try:
+        return get_adapter(List[item_type]).validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(body_errors(e, "body"))
 
 # ============= ENDPOINTS =============
 
@@ -54,9 +205,12 @@ def root():
             "docs": "/docs",
             "create_todo": "POST /todos",
             "get_todos": "GET /todos",
+            "export_todos": "GET /todos/export",
+            "search_todos": "GET /todos/search?q=...",
             "get_todo": "GET /todos/{todo_id}",
             "update_todo": "PUT /todos/{todo_id}",
-            "delete_todo": "DELETE /todos/{todo_id}"
+            "delete_todo": "DELETE /todos/{todo_id}",
+            "batch": "POST | PATCH | DELETE /todos/batch"
         }
     }
 
@@ -71,11 +225,8 @@ def create_todo(todo: TodoCreate):
     
     Returns the created todo with ID and timestamp
     """
-    global next_id
-    
-    # Create todo with ID and timestamp
+    # Create todo with timestamp (the store assigns the ID)
     todo_dict = {
-        "id": next_id,
         "title": todo.title,
         "description": todo.description,
         "completed": todo.completed,
@@ -83,32 +234,193 @@ def create_todo(todo: TodoCreate):
     }
     
     # Add to "database"
-    todos_db.append(todo_dict)
-    next_id += 1
-    
-    return todo_dict
+    return todo_response(store.create(todo_dict), status_code=201)
 
 @app.get("/todos", response_model=List[TodoResponse], tags=["Todos"])
 def get_todos(
+    response: Response,
     completed: Optional[bool] = None,
-    skip: int = 0,
-    limit: int = 10
+    cursor: Optional[int] = Query(None, description="Return todos after this ID"),
+    limit: int = Query(10, ge=1, le=1000)
 ):
     """
     Get all todos with optional filtering
     
     - **completed**: Filter by completion status (optional)
-    - **skip**: Number of todos to skip (pagination)
+    - **cursor**: ID of the last todo from the previous page (pagination)
     - **limit**: Maximum number of todos to return
+    
+    If there are more todos, the `X-Next-Cursor` header holds the
+    cursor for the next page
     """
-    # Filter by completed status if provided
-    if completed is not None:
-        filtered_todos = [t for t in todos_db if t["completed"] == completed]
-    else:
-        filtered_todos = todos_db
+    todos, next_cursor = store.page(completed=completed, cursor=cursor, limit=limit)
     
-    # Apply pagination
-    return filtered_todos[skip : skip + limit]
+    headers = {}
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = str(next_cursor)
+    
+    return todos_response(todos, response=response, headers=headers)
+
+def iter_ndjson_export(completed: Optional[bool], cursor: Optional[int]) -> Iterator[bytes]:
+    """Encode todos as NDJSON, one chunk of lines per store page"""
+    for todos in store.iter_pages(completed=completed, cursor=cursor):
+        yield b"".join(todo_encoder.encode(todo) + b"\n" for todo in todos)
+
+# Export, search and batch routes must be registered before /todos/{todo_id},
+# otherwise "export" / "search" / "batch" would be matched as a todo_id
+
+@app.get(
+    "/todos/export",
+    response_class=StreamingResponse,
+    tags=["Todos"],
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}}
+)
+def export_todos(
+    completed: Optional[bool] = None,
+    cursor: Optional[int] = Query(None, description="Resume after this ID")
+):
+    """
+    Export all todos as newline-delimited JSON (one todo per line)
+    
+    - **completed**: Filter by completion status (optional)
+    - **cursor**: ID of the last todo already received, to resume an export
+    
+    Todos are streamed in ID order, so memory use stays flat no matter
+    how many todos there are
+    """
+    return StreamingResponse(
+        iter_ndjson_export(completed, cursor),
+        media_type=NDJSON_MEDIA_TYPE
+    )
+
+@app.get("/todos/search", response_model=List[TodoResponse], tags=["Todos"])
+def search_todos(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Search query"),
+    completed: Optional[bool] = None,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    limit: int = Query(10, ge=1, le=1000)
+):
+    """
+    Search todo titles and descriptions, best match first
+    
+    - **q**: Words to search for; todos must contain all of them
+      - `OR` between words matches either side: `milk OR eggs`
+      - A trailing `*` matches by prefix: `gro*` matches "groceries"
+    - **completed**: Filter by completion status (optional)
+    - **cursor**: `X-Next-Cursor` from the previous page (pagination)
+    - **limit**: Maximum number of todos to return
+    
+    Matching is case-insensitive and title matches rank higher than
+    description matches. If there are more results, the `X-Next-Cursor`
+    header holds the cursor for the next page
+    """
+    try:
+        todos, next_cursor = store.search(q, completed=completed, cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid cursor: {cursor}"
+        )
+    
+    headers = {}
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = next_cursor
+    
+    return todos_response(todos, response=response, headers=headers)
+
+@app.post(
+    "/todos/batch",
+    response_model=List[TodoResponse],
+    status_code=201,
+    tags=["Batch"],
+    openapi_extra=batch_request_body(TodoCreate.model_json_schema())
+)
+async def create_todos_batch(request: Request):
+    """
+    Create many todos in one request
+    
+    Body is a JSON array of todos, or NDJSON (`Content-Type: application/x-ndjson`)
+    with one todo per line. Every item is validated before any todo is created.
+    
+    Returns the created todos in the same order
+    """
+    todos = await parse_batch(request, TodoCreate)
+    
+    created_at = datetime.now()
+    # Writes wait for the disk, so keep them off the event loop
+    created = await run_in_threadpool(store.create_many, [
+        {
+            "title": todo.title,
+            "description": todo.description,
+            "completed": todo.completed,
+            "created_at": created_at
+        }
+        for todo in todos
+    ])
+    
+    return todos_response(created, status_code=201)
+
+@app.patch(
+    "/todos/batch",
+    response_model=List[TodoResponse],
+    tags=["Batch"],
+    openapi_extra=batch_request_body(TodoBatchUpdate.model_json_schema())
+)
+async def update_todos_batch(request: Request):
+    """
+    Update many todos in one request
+    
+    Each item holds the **id** of the todo plus the fields to update.
+    If any ID is not found, nothing is updated and 404 is returned.
+    
+    Returns the updated todos in the same order
+    """
+    todo_updates = await parse_batch(request, TodoBatchUpdate)
+    
+    updates = [
+        (
+            todo_update.id,
+            {
+                field: value
+                for field, value in todo_update.model_dump(exclude={"id"}).items()
+                if value is not None
+            }
+        )
+        for todo_update in todo_updates
+    ]
+    
+    todos, missing = await run_in_threadpool(store.update_many, updates)
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Todos with ids {missing} not found"
+        )
+    
+    return todos_response(todos)
+
+@app.delete(
+    "/todos/batch",
+    tags=["Batch"],
+    openapi_extra=batch_request_body({"type": "integer"})
+)
+async def delete_todos_batch(request: Request):
+    """
+    Delete many todos in one request
+    
+    Body is a JSON array of IDs, or NDJSON with one ID per line.
+    If any ID is not found, nothing is deleted and 404 is returned.
+    """
+    todo_ids = await parse_batch(request, int)
+    
+    missing = await run_in_threadpool(store.delete_many, todo_ids)
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Todos with ids {missing} not found"
+        )
+    
+    return {"deleted": list(dict.fromkeys(todo_ids))}
 
 @app.get("/todos/{todo_id}", response_model=TodoResponse, tags=["Todos"])
 def get_todo(todo_id: int):
@@ -120,9 +432,9 @@ def get_todo(todo_id: int):
     Returns 404 if todo not found
     """
     # Find todo by ID
-    for todo in todos_db:
-        if todo["id"] == todo_id:
-            return todo
+    todo = store.get(todo_id)
+    if todo is not None:
+        return todo_response(todo)
     
     # If not found, raise 404 error
     raise HTTPException(
@@ -142,18 +454,16 @@ def update_todo(todo_id: int, todo_update: TodoUpdate):
     
     Only provided fields will be updated
     """
-    # Find todo
-    for todo in todos_db:
-        if todo["id"] == todo_id:
-            # Update only provided fields
-            if todo_update.title is not None:
-                todo["title"] = todo_update.title
-            if todo_update.description is not None:
-                todo["description"] = todo_update.description
-            if todo_update.completed is not None:
-                todo["completed"] = todo_update.completed
-            
-            return todo
+    # Update only provided fields
+    changes = {
+        field: value
+        for field, value in todo_update.model_dump().items()
+        if value is not None
+    }
+    
+    todo = store.update(todo_id, changes)
+    if todo is not None:
+        return todo_response(todo)
     
     # If not found, raise 404 error
     raise HTTPException(
@@ -170,13 +480,9 @@ def delete_todo(todo_id: int):
     
     Returns 204 No Content on success, 404 if not found
     """
-    global todos_db
-    
-    # Find and remove todo
-    for i, todo in enumerate(todos_db):
-        if todo["id"] == todo_id:
-            todos_db.pop(i)
-            return
+    # Remove todo
+    if store.delete(todo_id):
+        return
     
     # If not found, raise 404 error
     raise HTTPException(
@@ -186,14 +492,10 @@ def delete_todo(todo_id: int):
 
 @app.get("/todos/stats/summary", tags=["Stats"])
 def get_stats():
-    """Get statistics about todos"""
-    total = len(todos_db)
-    completed = sum(1 for t in todos_db if t["completed"])
-    pending = total - completed
-    
-    return {
-        "total": total,
-        "completed": completed,
-        "pending": pending,
-        "completion_rate": (completed / total * 100) if total > 0 else 0
-    }
\ No newline at end of file
+    """Get statistics about todos (counters are kept up to date on every write)"""
+    return store.stats()
+
+# ============= INSTRUMENTATION =============
+# Timing histograms, Server-Timing header and /metrics for every route above
+
+instrument(app)
@@ -0,0 +1,304 @@
+"""
+Persistence for the in-memory todo store
+Keeps todos on disk without a database server
+
+Files in the data directory:
+- wal-000001.log, wal-000002.log, ...: append-only write log, one JSON
+  record per line (see TodoStore for the record format)
+- snapshot.ndjson: a header line (next_id + first log segment it does NOT
+  cover) followed by one todo per line
+
+On startup the snapshot is loaded and only the log segments written after
+it are replayed, so restart time depends on recent writes, not on how many
+todos there are.
+"""
+from datetime import datetime
+from pathlib import Path
+from threading import Condition, Event, Lock, Thread
+from typing import Iterator, List, Optional
+import json
+import logging
+import mmap
+import os
+import re
+import time
+
+from store import TodoStore
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = "snapshot.ndjson"
+SEGMENT_PATTERN = re.compile(r"wal-(\d+)\.log$")
+
+
+def encode(record: dict) -> bytes:
+    """One record as a JSON line (datetimes as ISO 8601 strings)"""
+    return (json.dumps(record, default=datetime.isoformat) + "\n").encode()
+
+
+def decode_object(obj: dict) -> dict:
+    """json.loads hook turning created_at back into a datetime"""
+    created_at = obj.get("created_at")
+    if isinstance(created_at, str):
+        obj["created_at"] = datetime.fromisoformat(created_at)
+    return obj
+
+
+def segment_path(directory: Path, segment: int) -> Path:
+    return directory / f"wal-{segment:06d}.log"
+
+
+def fsync_directory(directory: Path) -> None:
+    """Make file creations/renames in `directory` durable"""
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# ============= WRITE LOG =============
+
+class SegmentedLog:
+    """
+    Append-only write log with group commit
+
+    append() only queues the encoded record. A background thread writes
+    everything queued so far with one write() and one fsync(), then wakes
+    up all writers waiting on those records. While one fsync is running the
+    next group builds up, so many concurrent writes share one fsync.
+
+    If a write or fsync fails the log stops for good: the records in that
+    group are lost, waiting writers get an error and append() refuses
+    anything new (the store checks this before changing its indexes).
+    """
+
+    def __init__(self, directory: Path, segment: int, commit_delay: float = 0.0):
+        self.directory = directory
+        self.segment = segment
+        # Optional extra wait before each fsync to let bigger groups form
+        self.commit_delay = commit_delay
+
+        self._file = open(segment_path(directory, segment), "ab")
+        fsync_directory(directory)
+
+        self._cond = Condition()
+        self._io_lock = Lock()
+        self._pending: List[bytes] = []
+        self._appended = 0
+        self._durable = 0
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+        self._writer = Thread(target=self._run, name="todo-wal-writer", daemon=True)
+        self._writer.start()
+
+    @property
+    def appended(self) -> int:
+        """Number of records appended since the log was opened"""
+        return self._appended
+
+    def append(self, record: dict) -> int:
+        line = encode(record)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Write log is closed")
+            if self._error is not None:
+                raise RuntimeError("Write log failed") from self._error
+            self._pending.append(line)
+            self._appended += 1
+            self._cond.notify_all()
+            return self._appended
+
+    def wait(self, ticket: int) -> None:
+        with self._cond:
+            while self._durable < ticket:
+                if self._error is not None:
+                    raise RuntimeError("Write log failed") from self._error
+                self._cond.wait()
+
+    def rotate(self) -> int:
+        """Flush the current segment and switch to the next one"""
+        with self._io_lock:
+            self._flush()
+            self._file.close()
+            self.segment += 1
+            self._file = open(segment_path(self.directory, self.segment), "ab")
+            fsync_directory(self.directory)
+            return self.segment
+
+    def close(self) -> None:
+        """Flush everything still queued and stop the writer thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._writer.join()
+        with self._io_lock:
+            self._flush()
+            self._file.close()
+
+    def _flush(self) -> None:
+        """Write and fsync everything queued (caller holds _io_lock)"""
+        with self._cond:
+            batch, self._pending = self._pending, []
+            last = self._appended
+        if batch:
+            try:
+                self._file.write(b"".join(batch))
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except BaseException as e:
+                with self._cond:
+                    self._error = e
+                    self._cond.notify_all()
+                raise
+        with self._cond:
+            self._durable = last
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+            if self.commit_delay:
+                time.sleep(self.commit_delay)
+            with self._io_lock:
+                try:
+                    self._flush()
+                except BaseException:
+                    logger.exception("Write log failed, no more writes will be accepted")
+                    return
+
+
+# ============= PERSISTENCE ENGINE =============
+
+class Persistence:
+    """
+    Loads a TodoStore from disk, logs its writes and snapshots it
+
+    - **directory**: Where the log segments and snapshot live
+    - **snapshot_interval**: Seconds between snapshot checks
+    - **snapshot_min_records**: Only snapshot once this many records were logged
+    - **commit_delay**: Extra seconds to wait before each fsync (group size)
+    """
+
+    def __init__(
+        self,
+        store: TodoStore,
+        directory: str,
+        snapshot_interval: float = 60.0,
+        snapshot_min_records: int = 1000,
+        commit_delay: float = 0.0
+    ):
+        self.store = store
+        self.directory = Path(directory)
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_min_records = snapshot_min_records
+        self.commit_delay = commit_delay
+
+        self.log: Optional[SegmentedLog] = None
+        self._snapshot_lock = Lock()
+        self._snapshot_at = 0
+        self._stop = Event()
+        self._snapshotter: Optional[Thread] = None
+
+    # ---------- startup ----------
+
+    def open(self) -> None:
+        """Recover the store from disk, then start logging its writes"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        first_segment = self._load_snapshot()
+        segments = [s for s in self._segments() if s >= first_segment]
+        for segment in segments:
+            for record in self._read_segment(segment):
+                self.store.apply(record)
+
+        # Never append to a replayed segment: it may end in a torn record
+        next_segment = max([first_segment - 1, *segments]) + 1
+        self.log = SegmentedLog(self.directory, next_segment, self.commit_delay)
+        self.store.log = self.log
+
+        self._stop.clear()
+        self._snapshotter = Thread(target=self._run, name="todo-snapshotter", daemon=True)
+        self._snapshotter.start()
+
+    def _segments(self) -> List[int]:
+        return sorted(
+            int(match.group(1))
+            for match in map(SEGMENT_PATTERN.match, os.listdir(self.directory))
+            if match
+        )
+
+    def _load_snapshot(self) -> int:
+        """Load the snapshot if there is one, returns the first segment to replay"""
+        path = self.directory / SNAPSHOT_FILE
+        if not path.exists() or path.stat().st_size == 0:
+            return 1
+
+        # Map the file instead of reading it, the OS pages it in as we go
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            lines = iter(data.readline, b"")
+            header = json.loads(next(lines))
+            todos = (json.loads(line, object_hook=decode_object) for line in lines)
+            self.store.load(todos, header["next_id"])
+        return header["segment"]
+
+    def _read_segment(self, segment: int) -> Iterator[dict]:
+        with open(segment_path(self.directory, segment), "rb") as f:
+            for line in f:
+                try:
+                    yield json.loads(line, object_hook=decode_object)
+                except ValueError:
+                    # A crash mid-append leaves a torn last record; it was
+                    # never acknowledged, so stop replaying this segment here
+                    return
+
+    # ---------- snapshots ----------
+
+    def snapshot(self) -> None:
+        """Write a compacted snapshot and drop the log segments it covers"""
+        with self._snapshot_lock:
+            appended = self.log.appended
+            todos, next_id, segment = self.store.checkpoint()
+
+            path = self.directory / SNAPSHOT_FILE
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(encode({"next_id": next_id, "segment": segment, "count": len(todos)}))
+                for start in range(0, len(todos), 1000):
+                    f.write(b"".join(encode(todo) for todo in todos[start : start + 1000]))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            fsync_directory(self.directory)
+
+            for old in self._segments():
+                if old < segment:
+                    segment_path(self.directory, old).unlink()
+            self._snapshot_at = appended
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.snapshot_interval):
+            if self.log.appended - self._snapshot_at >= self.snapshot_min_records:
+                try:
+                    self.snapshot()
+                except Exception:
+                    # e.g. disk full; the write log still has everything,
+                    # so keep serving and try again next interval
+                    logger.exception("Snapshot failed, retrying in %s s", self.snapshot_interval)
+
+    # ---------- shutdown ----------
+
+    def close(self) -> None:
+        """Stop background work and leave a fresh snapshot for the next start"""
+        self._stop.set()
+        if self._snapshotter is not None:
+            self._snapshotter.join()
+        if self.log.appended != self._snapshot_at:
+            self.snapshot()
+        self.store.log = None
+        self.log.close()
@@ -0,0 +1,211 @@
+"""
+Full-text search over todo titles and descriptions
+An inverted index (term -> todos containing it) kept up to date on every write
+"""
+from bisect import bisect_left
+from collections import Counter
+from heapq import nsmallest
+from math import log
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import re
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# A title word counts as much as this many description words
+TITLE_WEIGHT = 2
+
+# BM25 ranking parameters (the usual defaults)
+K1 = 1.2
+B = 0.75
+
+# One OR group is a list of (term, is_prefix) that must all match
+Query = List[List[Tuple[str, bool]]]
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase words"""
+    return TOKEN_PATTERN.findall(text.casefold()) if text else []
+
+
+def parse_query(q: str) -> Query:
+    """
+    Parse a search query into OR groups of AND terms
+
+    - Words are ANDed: `milk eggs` matches todos containing both
+    - `OR` (uppercase) separates alternatives: `milk OR eggs`
+    - A trailing `*` matches by prefix: `gro*` matches "groceries"
+
+    `milk eggs OR bread` means (milk AND eggs) OR bread
+    """
+    groups: Query = [[]]
+    for word in q.split():
+        if word == "OR":
+            groups.append([])
+            continue
+        prefix = word.endswith("*")
+        terms = tokenize(word)
+        # Only the last part of "e-mail*" is a prefix
+        groups[-1].extend((term, prefix and i == len(terms) - 1) for i, term in enumerate(terms))
+    return [group for group in groups if group]
+
+
+def encode_cursor(score: float, todo_id: int) -> str:
+    return f"{score!r}:{todo_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Parse a cursor made by encode_cursor
+
+    Raises ValueError if the cursor is malformed
+    """
+    score, _, todo_id = cursor.rpartition(":")
+    return float(score), int(todo_id)
+
+
+class SearchIndex:
+    """
+    Inverted index over todo titles and descriptions
+
+    - Postings: term -> {todo_id: weighted term count}
+    - Vocabulary: sorted list of terms, so prefix lookups are a binary search.
+      It's only re-sorted when a prefix query needs it after new terms
+      appeared or old ones disappeared, so writes never pay for it
+    - Per-todo term counts, so a todo can be removed without re-tokenizing
+    - Per-todo lengths (weighted word counts) for BM25 length normalization
+
+    A query only touches the postings of its own terms, so its cost grows
+    with the number of matches, not with the number of todos.
+
+    `todos` builds the index in bulk (e.g. when loading a snapshot).
+    """
+
+    def __init__(self, todos: Iterable[dict] = ()):
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._terms: Optional[List[str]] = None  # None: needs re-sorting
+        self._doc_terms: Dict[int, Counter] = {}
+        self._doc_lengths: Dict[int, int] = {}
+        self._total_length = 0
+        for todo in todos:
+            self._add(todo)
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    # ============= INDEXING =============
+
+    def add(self, todo: dict) -> None:
+        """Index a todo, replacing what was indexed for its ID before"""
+        self.remove(todo["id"])
+        self._add(todo)
+
+    def _add(self, todo: dict) -> None:
+        todo_id = todo["id"]
+        counts = Counter(tokenize(todo["description"]))
+        for term in tokenize(todo["title"]):
+            counts[term] += TITLE_WEIGHT
+
+        for term, count in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._terms = None
+            postings[todo_id] = count
+        self._doc_terms[todo_id] = counts
+        self._doc_lengths[todo_id] = length = sum(counts.values())
+        self._total_length += length
+
+    def remove(self, todo_id: int) -> None:
+        """Drop a todo from the index (no-op if it isn't indexed)"""
+        counts = self._doc_terms.pop(todo_id, None)
+        if counts is None:
+            return
+        for term in counts:
+            postings = self._postings[term]
+            del postings[todo_id]
+            if not postings:
+                del self._postings[term]
+                self._terms = None
+        self._total_length -= self._doc_lengths.pop(todo_id)
+
+    # ============= QUERIES =============
+
+    def _expand(self, term: str, prefix: bool) -> List[str]:
+        """Indexed terms matching `term` (all terms starting with it if `prefix`)"""
+        if not prefix:
+            return [term] if term in self._postings else []
+        if self._terms is None:
+            self._terms = sorted(self._postings)
+        start = bisect_left(self._terms, term)
+        end = bisect_left(self._terms, term + "\U0010ffff", start)
+        return self._terms[start:end]
+
+    def _term_scores(self, term: str, prefix: bool) -> Dict[int, float]:
+        """BM25 score of every todo matching one query term"""
+        count = len(self._doc_terms)
+        average_length = self._total_length / count if count else 0
+        scores: Dict[int, float] = {}
+        for indexed_term in self._expand(term, prefix):
+            postings = self._postings[indexed_term]
+            idf = log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for todo_id, tf in postings.items():
+                norm = K1 * (1 - B + B * self._doc_lengths[todo_id] / average_length)
+                scores[todo_id] = scores.get(todo_id, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+        return scores
+
+    def _group_scores(self, group: List[Tuple[str, bool]]) -> Dict[int, float]:
+        """Scores of the todos matching every term of an AND group"""
+        term_scores = sorted((self._term_scores(term, prefix) for term, prefix in group), key=len)
+        # Intersect starting from the term with the fewest matches
+        scores = term_scores[0]
+        for other in term_scores[1:]:
+            scores = {todo_id: score + other[todo_id] for todo_id, score in scores.items() if todo_id in other}
+            if not scores:
+                break
+        return scores
+
+    def search(
+        self,
+        query: Query,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        where: Optional[Callable[[int], bool]] = None
+    ) -> Tuple[List[int], Optional[str]]:
+        """
+        Get one page of matching todo IDs, best match first
+
+        - **query**: Parsed query (see parse_query)
+        - **cursor**: next_cursor from the previous page
+        - **limit**: Maximum number of IDs to return
+        - **where**: Only keep IDs this returns True for (optional)
+
+        Todos matching several OR groups get the sum of their scores. Ties
+        are ordered by ID. Returns (todo_ids, next_cursor); next_cursor is
+        None on the last page.
+
+        Raises ValueError if the cursor is malformed
+        """
+        after = None
+        if cursor is not None:
+            score, todo_id = decode_cursor(cursor)
+            after = (-score, todo_id)
+
+        scores: Dict[int, float] = {}
+        for group in query:
+            for todo_id, score in self._group_scores(group).items():
+                scores[todo_id] = scores.get(todo_id, 0.0) + score
+
+        ranked = (
+            (-score, todo_id) for todo_id, score in scores.items()
+            if (after is None or (-score, todo_id) > after)
+            and (where is None or where(todo_id))
+        )
+        # Only the page (plus one, to know if there's more) is ever sorted
+        page = nsmallest(limit + 1, ranked)
+
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            score, todo_id = page[-1]
+            next_cursor = encode_cursor(-score, todo_id)
+        return [todo_id for _, todo_id in page], next_cursor
@@ -0,0 +1,38 @@
+"""
+Fast JSON encoding for store records
+Skips response_model re-validation for data the API built itself
+"""
+from typing import List, Type
+
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import TypedDict
+
+
+def record_type(model: Type[BaseModel]) -> type:
+    """A TypedDict with the same fields and types as `model`"""
+    return TypedDict(
+        f"{model.__name__}Record",
+        {name: field.annotation for name, field in model.model_fields.items()}
+    )
+
+
+class RecordEncoder:
+    """
+    Encodes store records straight to the JSON bytes `model` would produce
+
+    Only for records the API created itself from validated input: records
+    are serialized by pydantic-core as they are, without validation or
+    copying (keys come out in the record's own order). The serializers
+    are built once, so each call stays in compiled code.
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        record = record_type(model)
+        self._one = TypeAdapter(record)
+        self._many = TypeAdapter(List[record])
+
+    def encode(self, record: dict) -> bytes:
+        return self._one.dump_json(record)
+
+    def encode_many(self, records: List[dict]) -> bytes:
+        return self._many.dump_json(records)
@@ -0,0 +1,419 @@
+"""
+In-memory todo store
+Keeps todos indexed so lookups don't scan the whole list
+"""
+from bisect import bisect_left, bisect_right, insort
+from threading import RLock
+from typing import Dict, Iterable, Iterator, List, Optional, Protocol, Tuple
+
+from search import SearchIndex, parse_query
+
+
+class WriteLog(Protocol):
+    """Where the store records its writes (see persistence.py)"""
+
+    def append(self, record: dict) -> int:
+        """
+        Queue a record, returns a ticket to pass to wait()
+
+        Must raise (without queueing) if the log can no longer be written
+        """
+
+    def wait(self, ticket: int) -> None:
+        """Block until the record for `ticket` is safely on disk"""
+
+    def rotate(self) -> int:
+        """Start a new log segment, returns its number"""
+
+
+class SortedIds:
+    """
+    Sorted list of todo ids, split into chunks
+
+    A plain sorted list has to shift every id after the insert/delete
+    position. Here only one chunk (at most 2 * CHUNK_SIZE ids) is shifted,
+    plus the short list of chunks when one is split or emptied.
+
+    - `_maxes[i]` is the largest id in `_chunks[i]`, so finding the chunk
+      for an id is a binary search
+    """
+
+    CHUNK_SIZE = 1000
+
+    def __init__(self, ids: Iterable[int] = ()):
+        """`ids` must already be sorted"""
+        ids = list(ids)
+        size = self.CHUNK_SIZE
+        self._chunks: List[List[int]] = [ids[i : i + size] for i in range(0, len(ids), size)]
+        self._maxes: List[int] = [chunk[-1] for chunk in self._chunks]
+        self._len = len(ids)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, todo_id: int) -> None:
+        self._len += 1
+        if not self._chunks:
+            self._chunks.append([todo_id])
+            self._maxes.append(todo_id)
+            return
+
+        i = bisect_left(self._maxes, todo_id)
+        if i == len(self._chunks):
+            # New ids are always the largest, so this is the common case
+            i -= 1
+            self._chunks[i].append(todo_id)
+            self._maxes[i] = todo_id
+        else:
+            insort(self._chunks[i], todo_id)
+
+        chunk = self._chunks[i]
+        if len(chunk) > 2 * self.CHUNK_SIZE:
+            half = len(chunk) // 2
+            self._chunks[i : i + 1] = [chunk[:half], chunk[half:]]
+            self._maxes[i : i + 1] = [chunk[half - 1], chunk[-1]]
+
+    def remove(self, todo_id: int) -> None:
+        """Remove an id (no-op if it isn't there)"""
+        i = bisect_left(self._maxes, todo_id)
+        if i == len(self._chunks):
+            return
+        chunk = self._chunks[i]
+        j = bisect_left(chunk, todo_id)
+        if j == len(chunk) or chunk[j] != todo_id:
+            return
+
+        del chunk[j]
+        self._len -= 1
+        if not chunk:
+            del self._chunks[i]
+            del self._maxes[i]
+        else:
+            self._maxes[i] = chunk[-1]
+
+    def after(self, cursor: Optional[int], limit: int) -> Tuple[List[int], bool]:
+        """Up to `limit` ids greater than `cursor`, and whether more follow"""
+        i = 0 if cursor is None else bisect_right(self._maxes, cursor)
+        if i == len(self._chunks):
+            return [], False
+        j = 0 if cursor is None else bisect_right(self._chunks[i], cursor)
+
+        ids = self._chunks[i][j : j + limit + 1]
+        for chunk in self._chunks[i + 1 :]:
+            if len(ids) > limit:
+                break
+            ids.extend(chunk[: limit + 1 - len(ids)])
+        return ids[:limit], len(ids) > limit
+
+
+class TodoStore:
+    """
+    Indexed in-memory storage for todos
+
+    - Primary index: id -> todo dict (O(1) lookups)
+    - Secondary indexes: all ids, and ids per completed value, as SortedIds
+      (inserts/deletes shift one chunk, not the whole index)
+    - Search index: words in title/description -> ids (see search.py)
+    - Stats counters updated on every write instead of recounted
+
+    Ids are handed out in increasing order, so a new id is appended to the
+    last chunk and cursor pagination is a binary search.
+
+    If a write log is attached, every write is recorded as one log
+    record, and write methods only return once that record is durable.
+    """
+
+    def __init__(self, log: Optional[WriteLog] = None):
+        self._todos: Dict[int, dict] = {}
+        self._ids = SortedIds()
+        self._by_completed: Dict[bool, SortedIds] = {True: SortedIds(), False: SortedIds()}
+        self._search = SearchIndex()
+        self._completed_count = 0
+        self._next_id = 1
+        # Sync endpoints run in a threadpool, so writes must not interleave
+        self._lock = RLock()
+        self.log = log
+
+    def __len__(self) -> int:
+        return len(self._todos)
+
+    def __contains__(self, todo_id: int) -> bool:
+        return todo_id in self._todos
+
+    # ============= INDEX HELPERS =============
+
+    def _index(self, todo: dict) -> None:
+        todo_id = todo["id"]
+        self._todos[todo_id] = todo
+        self._ids.add(todo_id)
+        self._by_completed[todo["completed"]].add(todo_id)
+        self._search.add(todo)
+        if todo["completed"]:
+            self._completed_count += 1
+        self._next_id = max(self._next_id, todo_id + 1)
+
+    def _unindex(self, todo: dict) -> None:
+        todo_id = todo["id"]
+        del self._todos[todo_id]
+        self._ids.remove(todo_id)
+        self._by_completed[todo["completed"]].remove(todo_id)
+        self._search.remove(todo_id)
+        if todo["completed"]:
+            self._completed_count -= 1
+
+    def _new(self, todo_dicts: List[dict]) -> List[dict]:
+        """Assign IDs to new todos (they're indexed by the caller)"""
+        return [{"id": self._next_id + i, **todo_dict} for i, todo_dict in enumerate(todo_dicts)]
+
+    def _update(self, todo: dict, changes: dict) -> dict:
+        completed = changes.get("completed")
+        if completed is not None and completed != todo["completed"]:
+            # Move the id to the other side of the completed index
+            self._by_completed[todo["completed"]].remove(todo["id"])
+            self._by_completed[completed].add(todo["id"])
+            self._completed_count += 1 if completed else -1
+
+        todo.update(changes)
+        if "title" in changes or "description" in changes:
+            self._search.add(todo)
+        return todo
+
+    # ============= WRITE LOG =============
+    # Records are appended while the lock is held, so the log order matches
+    # the order writes were applied. Waiting for the disk happens after the
+    # lock is released, so concurrent writers can share one fsync.
+    # Each write appends its record *before* changing any index: once the
+    # log has failed, append() raises and the store is left untouched.
+
+    def _record(self, record: dict) -> Optional[int]:
+        return self.log.append(record) if self.log is not None else None
+
+    def _wait(self, ticket: Optional[int]) -> None:
+        if ticket is not None:
+            self.log.wait(ticket)
+
+    def apply(self, record: dict) -> None:
+        """Re-apply a write log record (used when recovering, never logged)"""
+        with self._lock:
+            op = record["op"]
+            if op == "create":
+                for todo in record["todos"]:
+                    self._index(todo)
+            elif op == "update":
+                for todo_id, changes in record["updates"]:
+                    self._update(self._todos[todo_id], changes)
+            elif op == "delete":
+                for todo_id in record["ids"]:
+                    self._unindex(self._todos[todo_id])
+            else:
+                raise ValueError(f"Unknown write log record: {op!r}")
+
+    def load(self, todos: Iterable[dict], next_id: int) -> None:
+        """Replace the store contents, e.g. from a snapshot (never logged)"""
+        with self._lock:
+            # Built in bulk: one sort and one pass instead of a write per todo
+            self._todos = {todo["id"]: todo for todo in todos}
+            ids = sorted(self._todos)
+            by_completed = {True: [], False: []}
+            for todo_id in ids:
+                by_completed[self._todos[todo_id]["completed"]].append(todo_id)
+            self._ids = SortedIds(ids)
+            self._by_completed = {value: SortedIds(ids) for value, ids in by_completed.items()}
+            self._search = SearchIndex(self._todos.values())
+            self._completed_count = len(by_completed[True])
+            self._next_id = max(ids[-1] + 1 if ids else 1, next_id)
+
+    def checkpoint(self) -> Tuple[List[dict], int, Optional[int]]:
+        """
+        Take a consistent copy of the store for a snapshot
+
+        Returns (todos, next_id, segment). If a log is attached it is rotated
+        at the same instant, so the snapshot covers exactly the log segments
+        before `segment`.
+        """
+        with self._lock:
+            todos = [dict(todo) for todo in self._todos.values()]
+            segment = self.log.rotate() if self.log is not None else None
+            return todos, self._next_id, segment
+
+    # ============= CRUD =============
+
+    def create(self, todo_dict: dict) -> dict:
+        """
+        Store a new todo and assign it an ID
+
+        `todo_dict` must hold every field except `id`; returns the stored dict
+        """
+        with self._lock:
+            [todo] = self._new([todo_dict])
+            ticket = self._record({"op": "create", "todos": [todo]})
+            self._index(todo)
+        self._wait(ticket)
+        return todo
+
+    def get(self, todo_id: int) -> Optional[dict]:
+        """Get a todo by ID, or None if it doesn't exist"""
+        return self._todos.get(todo_id)
+
+    def update(self, todo_id: int, changes: dict) -> Optional[dict]:
+        """
+        Apply `changes` to a todo in place
+
+        Returns the updated todo, or None if it doesn't exist
+        """
+        with self._lock:
+            todo = self._todos.get(todo_id)
+            if todo is None:
+                return None
+            ticket = self._record({"op": "update", "updates": [(todo_id, changes)]})
+            self._update(todo, changes)
+        self._wait(ticket)
+        return todo
+
+    def delete(self, todo_id: int) -> bool:
+        """Delete a todo, returns False if it doesn't exist"""
+        with self._lock:
+            todo = self._todos.get(todo_id)
+            if todo is None:
+                return False
+            ticket = self._record({"op": "delete", "ids": [todo_id]})
+            self._unindex(todo)
+        self._wait(ticket)
+        return True
+
+    # ============= BATCH OPERATIONS =============
+    # Each batch runs under one lock acquisition, is written as a single
+    # log record and is all-or-nothing: if any ID is missing, nothing changes
+
+    def missing(self, todo_ids: Iterable[int]) -> List[int]:
+        """Get the IDs from `todo_ids` that aren't in the store"""
+        return [todo_id for todo_id in todo_ids if todo_id not in self._todos]
+
+    def create_many(self, todo_dicts: List[dict]) -> List[dict]:
+        """Store several new todos at once, returns them in the same order"""
+        with self._lock:
+            todos = self._new(todo_dicts)
+            ticket = self._record({"op": "create", "todos": todos})
+            for todo in todos:
+                self._index(todo)
+        self._wait(ticket)
+        return todos
+
+    def update_many(
+        self,
+        updates: List[Tuple[int, dict]]
+    ) -> Tuple[List[dict], List[int]]:
+        """
+        Apply several (todo_id, changes) updates at once
+
+        Returns (updated todos, missing IDs); nothing is updated if any
+        ID is missing
+        """
+        with self._lock:
+            missing = self.missing(dict.fromkeys(todo_id for todo_id, _ in updates))
+            if missing:
+                return [], missing
+            ticket = self._record({"op": "update", "updates": updates})
+            todos = [self._update(self._todos[todo_id], changes) for todo_id, changes in updates]
+        self._wait(ticket)
+        return todos, []
+
+    def delete_many(self, todo_ids: List[int]) -> List[int]:
+        """
+        Delete several todos at once
+
+        Returns the missing IDs; nothing is deleted if any ID is missing
+        """
+        with self._lock:
+            todo_ids = list(dict.fromkeys(todo_ids))
+            missing = self.missing(todo_ids)
+            if missing:
+                return missing
+            ticket = self._record({"op": "delete", "ids": todo_ids})
+            for todo_id in todo_ids:
+                self._unindex(self._todos[todo_id])
+        self._wait(ticket)
+        return []
+
+    # ============= QUERIES =============
+
+    def page(
+        self,
+        completed: Optional[bool] = None,
+        cursor: Optional[int] = None,
+        limit: int = 10
+    ) -> Tuple[List[dict], Optional[int]]:
+        """
+        Get one page of todos ordered by ID
+
+        - **completed**: Only return todos with this status (optional)
+        - **cursor**: Only return todos with an ID greater than this
+        - **limit**: Maximum number of todos to return
+
+        Returns (todos, next_cursor); next_cursor is None on the last page
+        """
+        with self._lock:
+            ids = self._ids if completed is None else self._by_completed[completed]
+            page_ids, has_more = ids.after(cursor, limit)
+
+            todos = [self._todos[todo_id] for todo_id in page_ids]
+            next_cursor = page_ids[-1] if has_more and page_ids else None
+            return todos, next_cursor
+
+    def iter_pages(
+        self,
+        completed: Optional[bool] = None,
+        cursor: Optional[int] = None,
+        page_size: int = 1000
+    ) -> Iterator[List[dict]]:
+        """
+        Walk the whole store one page at a time, ordered by ID
+
+        Only one page is held at a time and the lock is released between
+        pages, so long exports don't block writers. Todos created or deleted
+        mid-walk are picked up or skipped based on where the walk is.
+        """
+        while True:
+            todos, cursor = self.page(completed=completed, cursor=cursor, limit=page_size)
+            if todos:
+                yield todos
+            if cursor is None:
+                return
+
+    def search(
+        self,
+        q: str,
+        completed: Optional[bool] = None,
+        cursor: Optional[str] = None,
+        limit: int = 10
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Get one page of todos matching a search query, best match first
+
+        - **q**: Search query (see search.parse_query for the syntax)
+        - **completed**: Only return todos with this status (optional)
+        - **cursor**: next_cursor from the previous page
+        - **limit**: Maximum number of todos to return
+
+        Returns (todos, next_cursor); next_cursor is None on the last page
+
+        Raises ValueError if the cursor is malformed
+        """
+        query = parse_query(q)
+        with self._lock:
+            where = None
+            if completed is not None:
+                where = lambda todo_id: self._todos[todo_id]["completed"] == completed
+            todo_ids, next_cursor = self._search.search(query, cursor=cursor, limit=limit, where=where)
+            return [self._todos[todo_id] for todo_id in todo_ids], next_cursor
+
+    def stats(self) -> dict:
+        """Get todo counts without scanning the store"""
+        total = len(self._todos)
+        completed = self._completed_count
+        return {
+            "total": total,
+            "completed": completed,
+            "pending": total - completed,
+            "completion_rate": (completed / total * 100) if total > 0 else 0
+        }
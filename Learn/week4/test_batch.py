@@ -0,0 +1,37 @@
+"""
+Tests for the batch endpoints' body parsing
+
+Run from Learn/week4: python -m pytest test_batch.py
+"""
+import os
+
+# Keep todos in memory (no data/ directory)
+os.environ["TODO_DATA_DIR"] = ""
+
+from fastapi.testclient import TestClient
+
+from app import NDJSON_MEDIA_TYPE, app
+
+client = TestClient(app)
+
+
+def test_ndjson_batch_create():
+    body = b'{"title": "a", "description": "x"}\n\n{"title": "b", "description": "y"}\n'
+    response = client.post("/todos/batch", content=body, headers={"content-type": NDJSON_MEDIA_TYPE})
+    assert response.status_code == 201
+    assert [todo["title"] for todo in response.json()] == ["a", "b"]
+
+
+def test_ndjson_batch_reports_bad_line():
+    body = b'{"title": "a", "description": "x"}\n{"title": ""}\n'
+    response = client.post("/todos/batch", content=body, headers={"content-type": NDJSON_MEDIA_TYPE})
+    assert response.status_code == 422
+    assert {tuple(error["loc"][:2]) for error in response.json()["detail"]} == {("body", 2)}
+
+
+def test_non_utf8_body_is_422():
+    for content_type in ("application/json", NDJSON_MEDIA_TYPE):
+        body = b'{"title": "a", "description": "x"}\n\xff\xfe\n'
+        response = client.post("/todos/batch", content=body, headers={"content-type": content_type})
+        assert response.status_code == 422, content_type
+        assert response.json()["detail"][0]["type"] == "json_invalid"
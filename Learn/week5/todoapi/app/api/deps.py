@@ -0,0 +1,52 @@
+"""
+Shared dependencies for API endpoints
+"""
+from time import perf_counter
+from typing import AsyncGenerator, Generator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import (
+    AsyncSessionLocal,
+    SessionLocal,
+    async_pool_metrics,
+    sync_pool_metrics,
+)
+
+
+def get_db() -> Generator[Session, None, None]:
+    """
+    Get a sync database session
+
+    Use it in `def` endpoints:
+        def my_endpoint(db: Session = Depends(get_db)):
+            # db is automatically provided and cleaned up
+    """
+    db = SessionLocal()
+    try:
+        # Take a connection up front so the pool wait is measured here
+        start = perf_counter()
+        db.connection()
+        sync_pool_metrics.observe_wait(perf_counter() - start)
+
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get an async database session
+
+    Use it in `async def` endpoints, queries are awaited on the event loop:
+        async def my_endpoint(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(...)
+    """
+    async with AsyncSessionLocal() as db:
+        # Take a connection up front so the pool wait is measured here
+        start = perf_counter()
+        await db.connection()
+        async_pool_metrics.observe_wait(perf_counter() - start)
+
+        yield db
@@ -0,0 +1,19 @@
+"""
+API v1 router aggregator
+Combines all endpoint routers
+"""
+from fastapi import APIRouter
+from app.api.v1.endpoints import todos
+
+api_router = APIRouter()
+
+# Include todos router
+api_router.include_router(
+    todos.router,
+    prefix="/todos",
+    tags=["todos"]
+)
+
+# Future routers can be added here:
+# api_router.include_router(users.router, prefix="/users", tags=["users"])
+# api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
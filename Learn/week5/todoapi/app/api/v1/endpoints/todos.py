@@ -0,0 +1,234 @@
+"""
+Todo API endpoints
+"""
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from app.api.deps import get_async_db
+from app.schemas.todo import (
+    TodoBatchUpdate,
+    TodoCreate,
+    TodoList,
+    TodoResponse,
+    TodoUpdate,
+)
+from app.crud import crud_todo
+
+router = APIRouter()
+
+
+@router.post(
+    "/",
+    response_model=TodoResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create a new todo",
+    description="Create a new todo item with title and description"
+)
+async def create_todo(
+    todo: TodoCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create a new todo:
+    
+    - **title**: Todo title (1-100 characters)
+    - **description**: Todo description (max 500 characters)
+    - **completed**: Completion status (default: false)
+    """
+    return await crud_todo.create_todo(db=db, todo=todo)
+
+
+@router.get(
+    "/",
+    response_model=TodoList,
+    summary="Get all todos",
+    description="Retrieve todos page by page with optional filtering"
+)
+async def get_todos(
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum records to return"),
+    completed: Optional[bool] = Query(None, description="Filter by completion status"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get todos with optional filtering:
+    
+    - **cursor**: `next_cursor` from the previous page (omit for the first page)
+    - **limit**: Maximum number of records to return (1-1000)
+    - **completed**: Filter by completion status (optional)
+    
+    Todos are ordered by completion status, then ID
+    """
+    try:
+        todos, next_cursor = await crud_todo.get_todos(
+            db=db,
+            cursor=cursor,
+            limit=limit,
+            completed=completed
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor: {cursor}"
+        )
+    return {"todos": todos, "next_cursor": next_cursor, "limit": limit}
+
+
+# Batch routes must be registered before /{todo_id},
+# otherwise "batch" would be matched as a todo_id
+
+@router.post(
+    "/batch",
+    response_model=List[TodoResponse],
+    status_code=status.HTTP_201_CREATED,
+    summary="Create many todos",
+    description="Create many todos in one transaction"
+)
+async def create_todos(
+    todos: List[TodoCreate],
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create many todos at once (all or nothing)
+    
+    Returns the created todos in the same order
+    """
+    return await crud_todo.create_todos(db=db, todos=todos)
+
+
+@router.patch(
+    "/batch",
+    response_model=List[TodoResponse],
+    summary="Update many todos",
+    description="Update many todos in one transaction"
+)
+async def update_todos(
+    todo_updates: List[TodoBatchUpdate],
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update many todos at once
+    
+    Each item holds the **id** of the todo plus the fields to update.
+    If any ID is not found, nothing is updated
+    """
+    todos, missing = await crud_todo.update_todos(db=db, todo_updates=todo_updates)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Todos with ids {missing} not found"
+        )
+    return todos
+
+
+@router.delete(
+    "/batch",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete many todos",
+    description="Delete many todos by ID in one transaction"
+)
+async def delete_todos(
+    todo_ids: List[int] = Body(...),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete many todos by ID
+    
+    If any ID is not found, nothing is deleted
+    """
+    missing = await crud_todo.delete_todos(db=db, todo_ids=todo_ids)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Todos with ids {missing} not found"
+        )
+
+
+@router.get(
+    "/{todo_id}",
+    response_model=TodoResponse,
+    summary="Get a specific todo",
+    description="Retrieve a single todo by its ID"
+)
+async def get_todo(
+    todo_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a specific todo by ID
+    """
+    todo = await crud_todo.get_todo(db=db, todo_id=todo_id)
+    if not todo:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Todo with id {todo_id} not found"
+        )
+    return todo
+
+
+@router.put(
+    "/{todo_id}",
+    response_model=TodoResponse,
+    summary="Update a todo",
+    description="Update an existing todo item"
+)
+async def update_todo(
+    todo_id: int,
+    todo_update: TodoUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update a todo:
+    
+    - **title**: New title (optional)
+    - **description**: New description (optional)
+    - **completed**: New completion status (optional)
+    
+    Only provided fields will be updated
+    """
+    todo = await crud_todo.update_todo(db=db, todo_id=todo_id, todo_update=todo_update)
+    if not todo:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Todo with id {todo_id} not found"
+        )
+    return todo
+
+
+@router.delete(
+    "/{todo_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete a todo",
+    description="Delete a todo item by its ID"
+)
+async def delete_todo(
+    todo_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete a todo by ID
+    """
+    success = await crud_todo.delete_todo(db=db, todo_id=todo_id)
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Todo with id {todo_id} not found"
+        )
+
+
+@router.get(
+    "/stats/summary",
+    summary="Get todo statistics",
+    description="Get statistics about todos (total, completed, pending)"
+)
+async def get_stats(db: AsyncSession = Depends(get_async_db)):
+    """
+    Get statistics:
+    
+    - Total todos
+    - Completed todos
+    - Pending todos
+    - Completion rate
+    """
+    return await crud_todo.get_todo_count(db=db)
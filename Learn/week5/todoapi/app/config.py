@@ -0,0 +1,47 @@
+"""
+Application configuration
+Loads settings from environment variables
+"""
+from pydantic_settings import BaseSettings
+from functools import lru_cache
+from typing import Optional
+
+
+class Settings(BaseSettings):
+    """Application settings"""
+    
+    # Project info
+    PROJECT_NAME: str = "Todo API"
+    VERSION: str = "1.0.0"
+    
+    # Database
+    # PostgreSQL in production, SQLite works as a local/test stand-in
+    DATABASE_URL: str = "sqlite:///./todos.db"
+    # Async driver URL; derived from DATABASE_URL when not set
+    # (postgresql:// -> postgresql+asyncpg://, sqlite:// -> sqlite+aiosqlite://)
+    ASYNC_DATABASE_URL: Optional[str] = None
+    DB_ECHO: bool = False
+    
+    # Connection pool (per engine: the sync and async engines each get one)
+    DB_POOL_SIZE: int = 5          # Connections kept open
+    DB_MAX_OVERFLOW: int = 10      # Extra connections allowed under load
+    DB_POOL_TIMEOUT: float = 30    # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800    # Reconnect connections older than this (seconds)
+    DB_POOL_PRE_PING: bool = True  # Check connections are alive before using them
+    
+    class Config:
+        env_file = ".env"
+        case_sensitive = True
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    """
+    Get settings (cached)
+    lru_cache ensures we only load .env once
+    """
+    return Settings()
+
+
+# Create settings instance
+settings = get_settings()
@@ -0,0 +1,272 @@
+"""
+CRUD operations for Todo
+All database interactions go here
+
+Written for large tables:
+- Pagination is keyset-based on (completed, id), backed by the
+  ix_todos_completed_id index, so page 10,000 costs the same as page 1
+- Writes use INSERT/UPDATE/DELETE ... RETURNING, so no re-select is
+  needed after committing
+- Batch writes run as one executemany per batch in a single transaction
+"""
+from sqlalchemy import delete, func, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from app.models.todo import Todo
+from app.schemas.todo import TodoBatchUpdate, TodoCreate, TodoUpdate
+
+
+# ============= CURSORS =============
+
+def encode_cursor(todo: Todo) -> str:
+    """Cursor pointing just after `todo` in (completed, id) order"""
+    return f"{int(todo.completed)}:{todo.id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[bool, int]:
+    """
+    Parse a cursor made by encode_cursor
+
+    Raises ValueError if the cursor is malformed
+    """
+    completed, todo_id = cursor.split(":")
+    if completed not in ("0", "1"):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return completed == "1", int(todo_id)
+
+
+# ============= READ =============
+
+async def get_todo(db: AsyncSession, todo_id: int) -> Optional[Todo]:
+    """
+    Get a single todo by ID
+
+    Args:
+        db: Database session
+        todo_id: ID of the todo to retrieve
+
+    Returns:
+        Todo object if found, None otherwise
+    """
+    return await db.get(Todo, todo_id)
+
+
+async def get_todos(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    completed: Optional[bool] = None
+) -> Tuple[List[Todo], Optional[str]]:
+    """
+    Get one page of todos, ordered by (completed, id)
+
+    Args:
+        db: Database session
+        cursor: next_cursor from the previous page (None for the first page)
+        limit: Maximum number of records to return
+        completed: Filter by completion status (optional)
+
+    Returns:
+        (todos, next_cursor); next_cursor is None on the last page
+
+    Raises:
+        ValueError: if the cursor is malformed
+    """
+    query = select(Todo)
+
+    # Apply filter if provided
+    if completed is not None:
+        query = query.where(Todo.completed == completed)
+
+    # Seek past the previous page instead of OFFSET-ing over it
+    if cursor is not None:
+        after_completed, after_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(Todo.completed, Todo.id) > tuple_(after_completed, after_id)
+        )
+
+    # Fetch one extra row to know whether there is a next page
+    query = query.order_by(Todo.completed, Todo.id).limit(limit + 1)
+    todos = list((await db.scalars(query)).all())
+
+    if len(todos) > limit:
+        todos = todos[:limit]
+        return todos, encode_cursor(todos[-1])
+    return todos, None
+
+
+async def get_todo_count(db: AsyncSession) -> dict:
+    """
+    Get todo statistics in a single query
+
+    Returns:
+        Dictionary with total, completed, and pending counts
+    """
+    total, completed = (
+        await db.execute(
+            select(func.count(), func.count().filter(Todo.completed.is_(True)))
+            .select_from(Todo)
+        )
+    ).one()
+    pending = total - completed
+
+    return {
+        "total": total,
+        "completed": completed,
+        "pending": pending,
+        "completion_rate": (completed / total * 100) if total > 0 else 0
+    }
+
+
+# ============= WRITE =============
+
+async def create_todo(db: AsyncSession, todo: TodoCreate) -> Todo:
+    """
+    Create a new todo
+
+    Args:
+        db: Database session
+        todo: TodoCreate schema with todo data
+
+    Returns:
+        Created Todo object (id and created_at come back via RETURNING)
+    """
+    db_todo = await db.scalar(
+        insert(Todo).values(**todo.model_dump()).returning(Todo)
+    )
+    await db.commit()
+    return db_todo
+
+
+async def update_todo(
+    db: AsyncSession,
+    todo_id: int,
+    todo_update: TodoUpdate
+) -> Optional[Todo]:
+    """
+    Update an existing todo
+
+    Args:
+        db: Database session
+        todo_id: ID of todo to update
+        todo_update: TodoUpdate schema with fields to update
+
+    Returns:
+        Updated Todo object if found, None otherwise
+    """
+    # Get update data (only fields that were provided and aren't null)
+    update_data = todo_update.model_dump(exclude_unset=True, exclude_none=True)
+    if not update_data:
+        return await get_todo(db, todo_id)
+
+    db_todo = await db.scalar(
+        update(Todo)
+        .where(Todo.id == todo_id)
+        .values(**update_data)
+        .returning(Todo)
+    )
+    await db.commit()
+    return db_todo
+
+
+async def delete_todo(db: AsyncSession, todo_id: int) -> bool:
+    """
+    Delete a todo
+
+    Args:
+        db: Database session
+        todo_id: ID of todo to delete
+
+    Returns:
+        True if deleted, False if not found
+    """
+    deleted_id = await db.scalar(
+        delete(Todo).where(Todo.id == todo_id).returning(Todo.id)
+    )
+    await db.commit()
+    return deleted_id is not None
+
+
+# ============= BATCH WRITE =============
+# One transaction per batch: either every item is written or none is
+
+async def create_todos(db: AsyncSession, todos: List[TodoCreate]) -> List[Todo]:
+    """
+    Create many todos at once
+
+    SQLAlchemy sends the rows as multi-row INSERT ... VALUES ... RETURNING
+    batches ("insertmanyvalues"), not one INSERT per todo
+
+    Returns:
+        Created Todo objects, in the same order as `todos`
+    """
+    if not todos:
+        return []
+    db_todos = await db.scalars(
+        insert(Todo).returning(Todo, sort_by_parameter_order=True),
+        [todo.model_dump() for todo in todos]
+    )
+    db_todos = list(db_todos.all())
+    await db.commit()
+    return db_todos
+
+
+async def update_todos(
+    db: AsyncSession,
+    todo_updates: List[TodoBatchUpdate]
+) -> Tuple[List[Todo], List[int]]:
+    """
+    Update many todos at once
+
+    Rows are updated by primary key with executemany (one UPDATE statement,
+    many parameter sets), then all of them are read back with one SELECT
+
+    Returns:
+        (updated todos, missing IDs); nothing is updated if any ID is missing
+    """
+    ids = list(dict.fromkeys(todo_update.id for todo_update in todo_updates))
+    if not ids:
+        return [], []
+
+    found = set(await db.scalars(select(Todo.id).where(Todo.id.in_(ids))))
+    missing = [todo_id for todo_id in ids if todo_id not in found]
+    if missing:
+        return [], missing
+
+    rows = [
+        todo_update.model_dump(exclude_unset=True, exclude_none=True) | {"id": todo_update.id}
+        for todo_update in todo_updates
+    ]
+    await db.execute(update(Todo), rows)
+
+    db_todos = await db.scalars(
+        select(Todo)
+        .where(Todo.id.in_(ids))
+        .execution_options(populate_existing=True)
+    )
+    by_id = {db_todo.id: db_todo for db_todo in db_todos}
+    await db.commit()
+    return [by_id[todo_id] for todo_id in ids], []
+
+
+async def delete_todos(db: AsyncSession, todo_ids: List[int]) -> List[int]:
+    """
+    Delete many todos at once with a single DELETE ... WHERE id IN (...)
+
+    Returns:
+        Missing IDs; nothing is deleted if any ID is missing
+    """
+    ids = list(dict.fromkeys(todo_ids))
+    if not ids:
+        return []
+
+    deleted = set(await db.scalars(
+        delete(Todo).where(Todo.id.in_(ids)).returning(Todo.id)
+    ))
+    missing = [todo_id for todo_id in ids if todo_id not in deleted]
+    if missing:
+        await db.rollback()
+        return missing
+
+    await db.commit()
+    return []
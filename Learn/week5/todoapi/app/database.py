@@ -0,0 +1,170 @@
+"""
+Database connection and session management
+
+Two engines point at the same database:
+- engine / SessionLocal: sync sessions, for endpoints defined with `def`
+- async_engine / AsyncSessionLocal: async sessions, for `async def` endpoints
+  (no threadpool thread is held while waiting on the database)
+
+Both use the pool settings from app.config and report pool usage
+through PoolMetrics.
+"""
+from threading import Lock
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+
+# Async drivers for each sync database URL scheme
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def get_async_url(url: str) -> str:
+    """Turn a sync database URL into one that uses an async driver"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(
+            f"No async driver known for '{backend}', set ASYNC_DATABASE_URL"
+        )
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(
+        hide_password=False
+    )
+
+
+def is_in_memory_sqlite(url: str) -> bool:
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(url: str) -> dict:
+    """
+    Keyword arguments for create_engine / create_async_engine
+
+    SQLite notes:
+    - connections are shared across FastAPI's threadpool, so
+      check_same_thread is turned off
+    - an in-memory database only lives on its one connection, so it gets
+      a StaticPool (and the sync and async engines each get their own
+      database - tables are created on both at startup, but data written
+      through one isn't visible to the other; use a file when both are needed)
+    """
+    options = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+    if make_url(url).get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        if is_in_memory_sqlite(url):
+            options["poolclass"] = StaticPool
+            return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+
+def pool_capacity(url: str) -> int:
+    """Most connections the pool will ever hand out at once"""
+    if is_in_memory_sqlite(url):
+        return 1
+    return settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+
+
+class PoolMetrics:
+    """
+    Connection pool usage for one engine
+
+    Checkouts/checkins are tracked with pool events. Checkout wait is
+    reported by the session dependencies in app.api.deps, which take a
+    connection as soon as a request starts.
+    """
+
+    def __init__(self, engine: Engine, capacity: int):
+        self.pool = engine.pool
+        self.capacity = capacity
+        self._lock = Lock()
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.checkouts = 0
+        self.wait_count = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+        event.listen(self.pool, "checkout", self._on_checkout)
+        event.listen(self.pool, "checkin", self._on_checkin)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.in_use -= 1
+
+    def observe_wait(self, seconds: float) -> None:
+        """Record how long a request waited to get a connection"""
+        with self._lock:
+            self.wait_count += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def snapshot(self) -> dict:
+        """Current pool metrics as a dict"""
+        with self._lock:
+            return {
+                "pool": self.pool.status(),
+                "capacity": self.capacity,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "utilization": self.in_use / self.capacity,
+                "checkouts": self.checkouts,
+                "checkout_wait_avg_seconds": (
+                    self.wait_seconds_total / self.wait_count if self.wait_count else 0.0
+                ),
+                "checkout_wait_max_seconds": self.wait_seconds_max,
+            }
+
+
+# Sync engine
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+
+# Async engine
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or get_async_url(settings.DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL))
+
+# Session factories
+# Session is how we talk to the database
+SessionLocal = sessionmaker(
+    autocommit=False,  # Don't auto-commit (we control when to save)
+    autoflush=False,   # Don't auto-flush (we control when to sync)
+    bind=engine        # Bind to our engine
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    # Objects stay usable after commit without a lazy (blocking) reload
+    expire_on_commit=False
+)
+
+# Pool metrics
+sync_pool_metrics = PoolMetrics(engine, pool_capacity(settings.DATABASE_URL))
+async_pool_metrics = PoolMetrics(async_engine.sync_engine, pool_capacity(ASYNC_DATABASE_URL))
+
+# Base class for all database models
+Base = declarative_base()
@@ -0,0 +1,87 @@
+"""
+FastAPI application entry point
+"""
+from contextlib import asynccontextmanager
+from pathlib import Path
+import sys
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+from app.config import settings
+from app.database import Base, async_engine, async_pool_metrics, engine, sync_pool_metrics
+from app.api.v1.api import api_router
+
+# Shared request instrumentation lives in Learn/instrumentation
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from instrumentation import instrument
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create tables on startup, close pooled connections on shutdown"""
+    # This creates tables if they don't exist. Endpoints use the async
+    # engine; the sync one is done too since an in-memory SQLite database
+    # (DATABASE_URL=sqlite://) is a separate database per engine
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Base.metadata.create_all(bind=engine)
+    yield
+    await async_engine.dispose()
+    engine.dispose()
+
+
+# Initialize FastAPI app
+app = FastAPI(
+    title=settings.PROJECT_NAME,
+    version=settings.VERSION,
+    description="A production-ready Todo API with PostgreSQL",
+    docs_url="/docs",
+    redoc_url="/redoc",
+    lifespan=lifespan
+)
+
+# Configure CORS (if needed for frontend)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],  # In production, specify actual origins
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Include API router
+app.include_router(api_router, prefix="/api/v1")
+
+
+@app.get("/", tags=["Root"])
+def root():
+    """Root endpoint"""
+    return {
+        "message": f"Welcome to {settings.PROJECT_NAME}",
+        "version": settings.VERSION,
+        "docs": "/docs"
+    }
+
+
+@app.get("/health", tags=["Health"])
+def health_check():
+    """Health check endpoint"""
+    return {
+        "status": "healthy",
+        "service": settings.PROJECT_NAME,
+        "version": settings.VERSION
+    }
+
+
+@app.get("/health/db-pool", tags=["Health"])
+def db_pool_metrics():
+    """Connection pool utilization and checkout wait times"""
+    return {
+        "sync": sync_pool_metrics.snapshot(),
+        "async": async_pool_metrics.snapshot()
+    }
+
+
+# Timing histograms, Server-Timing header and /metrics for every route above
+instrument(app)
@@ -0,0 +1,53 @@
+"""
+SQLAlchemy model for Todo
+Defines the database table structure
+"""
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class Todo(Base):
+    """
+    Todo database model
+    This creates the 'todos' table in PostgreSQL
+    """
+    
+    __tablename__ = "todos"
+    
+    __table_args__ = (
+        # Matches the keyset pagination order in crud_todo.get_todos,
+        # so "WHERE (completed, id) > (...) ORDER BY completed, id LIMIT n"
+        # is a single index range scan
+        Index("ix_todos_completed_id", "completed", "id"),
+    )
+    
+    # Primary key - unique identifier
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Title - required string
+    title = Column(String(100), nullable=False, index=True)
+    
+    # Description - optional string
+    description = Column(String(500), nullable=True)
+    
+    # Completion status - defaults to False
+    completed = Column(Boolean, default=False, nullable=False)
+    
+    # Timestamp - automatically set on creation
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),  # PostgreSQL function
+        nullable=False
+    )
+    
+    # Timestamp - automatically updated on modification
+    updated_at = Column(
+        DateTime(timezone=True),
+        onupdate=func.now(),  # Update on every modification
+        nullable=True
+    )
+    
+    def __repr__(self):
+        """String representation for debugging"""
+        return f"<Todo(id={self.id}, title='{self.title}', completed={self.completed})>"
@@ -0,0 +1,78 @@
+"""
+Pydantic schemas for Todo
+Defines API request/response formats
+"""
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+class TodoBase(BaseModel):
+    """Base schema with common fields"""
+    title: str = Field(..., min_length=1, max_length=100)
+    description: str = Field(..., max_length=500)
+    completed: bool = Field(default=False)
+
+
+class TodoCreate(TodoBase):
+    """
+    Schema for creating a todo
+    Client sends this in POST request
+    """
+    pass
+
+
+class TodoUpdate(BaseModel):
+    """
+    Schema for updating a todo
+    All fields are optional (client can update any combination)
+    """
+    title: Optional[str] = Field(None, min_length=1, max_length=100)
+    description: Optional[str] = Field(None, max_length=500)
+    completed: Optional[bool] = None
+
+
+class TodoBatchUpdate(TodoUpdate):
+    """
+    Schema for one item of a batch update
+    TodoUpdate plus the ID of the todo to update
+    """
+    id: int
+
+
+class TodoResponse(TodoBase):
+    """
+    Schema for todo response
+    API returns this to client
+    Includes fields that are generated by database (id, timestamps)
+    """
+    id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        """Pydantic configuration"""
+        # Allows Pydantic to work with SQLAlchemy models
+        from_attributes = True
+        
+        # Example for documentation
+        json_schema_extra = {
+            "example": {
+                "id": 1,
+                "title": "Learn SQLAlchemy",
+                "description": "Study ORM concepts",
+                "completed": False,
+                "created_at": "2026-02-08T10:00:00",
+                "updated_at": None
+            }
+        }
+
+
+class TodoList(BaseModel):
+    """
+    Schema for one page of todos (keyset pagination)
+    Pass next_cursor back as `cursor` to get the next page
+    """
+    todos: list[TodoResponse]
+    next_cursor: Optional[str] = None
+    limit: int